@@ -0,0 +1,82 @@
+class AnalysisGraph:
+    """Lazily computed, memoized analysis results with declared dependencies.
+
+    Input nodes hold values set from outside (loaded frames, parameters);
+    derived nodes are computed from their dependencies on first request and
+    cached. Setting an input to a different value, or invalidating a node,
+    drops the cached results downstream of it and nothing else, so the next
+    request recomputes only what is missing.
+    """
+
+    def __init__(self):
+        self._compute = {}
+        self._depends = {}
+        self._dependents = {}
+        self._values = {}
+        self.computations = {}  # node -> number of times it was computed
+
+    def input(self, name, value=None):
+        """Declare an input node with an initial value."""
+        self._depends[name] = ()
+        self._dependents.setdefault(name, set())
+        self._values[name] = value
+
+    def node(self, name, compute, depends=()):
+        """Declare a derived node computed as ``compute(*dependency_values)``."""
+        self._compute[name] = compute
+        self._depends[name] = tuple(depends)
+        self._dependents.setdefault(name, set())
+        for dependency in depends:
+            self._dependents.setdefault(dependency, set()).add(name)
+
+    def downstream(self, name):
+        """Every node that depends on ``name``, directly or not."""
+        found, pending = set(), [name]
+        while pending:
+            for dependent in self._dependents.get(pending.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+
+    def invalidate(self, name):
+        """Drop the cached value of ``name`` (unless it is an input) and of
+        everything downstream of it."""
+        stale = self.downstream(name)
+        if name in self._compute:
+            stale.add(name)
+        for node in stale:
+            self._values.pop(node, None)
+
+    @staticmethod
+    def _same(old, new):
+        if old is new:
+            return True
+        if isinstance(new, (str, int, float, tuple, dict, type(None))):
+            try:
+                return bool(old == new)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def set(self, name, value):
+        """Set an input; a changed value invalidates everything downstream."""
+        if name in self._values and self._same(self._values[name], value):
+            return
+        self._values[name] = value
+        self.invalidate(name)
+
+    def is_cached(self, name):
+        return name in self._values
+
+    def get(self, name):
+        """Value of ``name``, computing missing dependencies first."""
+        if name in self._values:
+            return self._values[name]
+        if name not in self._compute:
+            raise KeyError(f"Unknown analysis node: {name}")
+        arguments = [self.get(dependency) for dependency in self._depends[name]]
+        value = self._compute[name](*arguments)
+        self._values[name] = value
+        self.computations[name] = self.computations.get(name, 0) + 1
+        return value
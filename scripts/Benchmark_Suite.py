@@ -0,0 +1,185 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from scripts.CorrelationBetweenStockAndNews import CombinedAnalysis
+from scripts.Synthetic_Data import generate_news, generate_prices, write_price_csvs
+from scripts.Technical_Indicators import compute_indicators, load_price_panel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10_000, 1_000_000, 10_000_000)
+
+
+class StageTimer:
+    """Wall time, CPU time and peak traced memory of pipeline stages.
+
+    Tracing allocations slows pandas and pure Python code several times
+    over, so with ``trace_memory`` each stage is timed untraced first and
+    then run a second time under tracemalloc for its peak memory.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    def run(self, stage, rows, function, *args, **kwargs):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = function(*args, **kwargs)
+        seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+
+        peak = None
+        if self.trace_memory:
+            tracemalloc.start()
+            try:
+                function(*args, **kwargs)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        self.records.append({
+            "stage": stage,
+            "rows": rows,
+            "seconds": round(seconds, 6),
+            "cpu_seconds": round(cpu_seconds, 6),
+            "peak_mb": None if peak is None else round(peak / 2**20, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        })
+        logger.info("%s rows=%s took %.3fs (peak %s MB)", stage, rows, seconds,
+                    self.records[-1]["peak_mb"])
+        return result
+
+
+def _recompute(graph, node):
+    """Recompute one analysis graph node from its cached dependencies."""
+    graph.invalidate(node)
+    return graph.get(node)
+
+
+def run_size(rows, data_dir, timer, backend="fast", n_workers=None, seed=0,
+             align_sessions=True):
+    """Generate ``rows`` news rows and ``rows`` price bars and time every stage.
+
+    The analysis stages are the nodes of a ``CombinedAnalysis`` graph (all
+    news against the first ticker's prices), each recomputed on its own, so
+    the results time the code the analysis actually runs.
+    """
+    prices = generate_prices(rows, seed=seed)
+    tickers = sorted(prices["Ticker"].unique())
+    news = generate_news(rows, tickers=tickers, seed=seed)
+    news_path = os.path.join(data_dir, f"news_{rows}.csv")
+    # CombinedAnalysis reads the publication time from a Date column
+    news.rename(columns={"date": "Date"}).to_csv(news_path, index=False)
+    price_paths = write_price_csvs(prices, os.path.join(data_dir, f"prices_{rows}"))
+    del news, prices
+
+    # Loads the news with read_news_csv and compact_news_frame
+    analysis = timer.run(
+        "load_news", rows, CombinedAnalysis, news_path, price_paths[0],
+        align_sessions=align_sessions,
+    )
+    close_panel = timer.run("load_prices", rows, load_price_panel, price_paths)
+    analysis.engine_options["n_workers"] = n_workers
+    analysis.graph.set("backend", backend)
+    graph = analysis.graph
+    returns = graph.get("returns")
+
+    timer.run("dates", rows, _recompute, graph, "news_dates")
+    if align_sessions:
+        timer.run("sessions", rows, _recompute, graph, "news_days")
+    timer.run("sentiment", rows, _recompute, graph, "scores")
+    timer.run("aggregation", rows, _recompute, graph, "daily_sentiment")
+    # join_on_sessions with aligned sessions, pd.merge on dates otherwise
+    merged = timer.run("merge", len(returns), _recompute, graph, "merged")
+    timer.run("correlation", len(merged), _recompute, graph, "correlation")
+    timer.run("indicators", close_panel.size, compute_indicators, close_panel)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, output_path="benchmark_results.json",
+                   backend="fast", n_workers=None, trace_memory=True, data_dir=None,
+                   seed=0, align_sessions=True):
+    """Run the whole suite for every size and write the results as JSON.
+
+    Generated data goes to ``data_dir`` (a temporary directory by default).
+    Returns the result document that was written.
+    """
+    timer = StageTimer(trace_memory=trace_memory)
+    if data_dir is not None:
+        os.makedirs(data_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in sizes:
+            run_size(rows, data_dir or tmp_dir, timer, backend, n_workers, seed,
+                     align_sessions)
+
+    results = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "backend": backend,
+        "seed": seed,
+        "align_sessions": align_sessions,
+        "results": timer.records,
+    }
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def compare_results(baseline_path, current_path):
+    """Per stage and size, the ratio of current to baseline wall time and peak memory."""
+    frames = []
+    for path in (baseline_path, current_path):
+        with open(path) as f:
+            frames.append(pd.DataFrame(json.load(f)["results"]).set_index(["stage", "rows"]))
+    baseline, current = frames
+    return pd.DataFrame({
+        "baseline_seconds": baseline["seconds"],
+        "current_seconds": current["seconds"],
+        "time_ratio": current["seconds"] / baseline["seconds"],
+        "memory_ratio": current["peak_mb"] / baseline["peak_mb"],
+    }).dropna(subset=["baseline_seconds", "current_seconds"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile every pipeline stage.")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--backend", default="fast", help="Sentiment backend (textblob or fast)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (lower overhead)")
+    parser.add_argument("--data-dir", default=None, help="Keep the generated data here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-sessions", action="store_true",
+                        help="Group news by publication day instead of trading session")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.rows, args.output, args.backend, args.workers,
+                             not args.no_memory, args.data_dir, args.seed, not args.no_sessions)
+    print(pd.DataFrame(results["results"]).to_string(index=False))
+    print(f"Results written to {args.output}")
+    if args.compare:
+        print(compare_results(args.compare, args.output).to_string())
@@ -0,0 +1,54 @@
+import os
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class ChartOutput:
+    """Where the plotting methods send their figures.
+
+    Without an ``output_dir`` figures go through pyplot and ``plt.show()``
+    as before. With one, figures are built with the object-oriented API on
+    an Agg canvas (never registered with pyplot, so nothing blocks and no
+    global state is shared) and written to ``output_dir`` as
+    ``<prefix>_<name>.<format>`` for every requested format.
+    """
+
+    def __init__(self, output_dir=None, formats=("png",), prefix=None, dpi=100):
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.prefix = prefix
+        self.dpi = dpi
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+
+    @property
+    def headless(self):
+        return self.output_dir is not None
+
+    def figure(self, figsize=(10, 6)):
+        """Return a new figure for one chart."""
+        if not self.headless:
+            return plt.figure(figsize=figsize)
+        figure = Figure(figsize=figsize)
+        FigureCanvasAgg(figure)
+        return figure
+
+    def finish(self, figure, name):
+        """Show the figure, or write it to disk and release it.
+
+        Returns the written file paths in headless mode, otherwise None.
+        """
+        if not self.headless:
+            plt.show()
+            return None
+
+        stem = f"{self.prefix}_{name}" if self.prefix else name
+        paths = []
+        for image_format in self.formats:
+            path = os.path.join(self.output_dir, f"{stem}.{image_format}")
+            figure.savefig(path, format=image_format, dpi=self.dpi)
+            paths.append(path)
+        figure.clear()
+        return paths
@@ -0,0 +1,71 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts.Stock_Data_EDA import EDA
+
+STOCK_CHARTS = (
+    "plot_date_trends",
+    "plot_stock_prices",
+    "plot_volume",
+    "real_time_exchange_plot",
+    "plot_calculate_rsi",
+    "calculate_moving_averages",
+    "plot_calculate_macd",
+)
+
+
+def render_stock_file(file_path, output_dir, formats=("png",)):
+    """Render every EDA chart of one price file and return the written paths."""
+    eda = EDA(file_path, output_dir=output_dir, formats=formats)
+    eda.load_data()
+    paths = []
+    for chart in STOCK_CHARTS:
+        paths.extend(getattr(eda, chart)() or [])
+    return paths
+
+
+def render_stock_charts(file_paths, output_dir, formats=("png",), n_workers=None):
+    """Render the EDA charts of many price files in a process pool.
+
+    Returns a dict mapping each input file to the chart files written for it.
+    """
+    file_paths = list(file_paths)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        results = pool.map(
+            render_stock_file,
+            file_paths,
+            [output_dir] * len(file_paths),
+            [tuple(formats)] * len(file_paths),
+        )
+        return dict(zip(file_paths, results))
+
+
+def render_news_charts(news_analysis):
+    """Render the charts of a ``NewsAnalysis`` built with an ``output_dir``."""
+    paths = []
+    paths.extend(news_analysis.calculate_headline_length() or [])
+    paths.extend(news_analysis.plot_top_publishers() or [])
+    paths.extend(news_analysis.plot_publication_trends() or [])
+    paths.extend(news_analysis.display_domain_distribution() or [])
+    paths.extend(news_analysis.plot_sentiment_distribution() or [])
+    paths.extend(news_analysis.plot_sentiment_per_publisher() or [])
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render all stock charts to files.")
+    parser.add_argument("output_dir")
+    parser.add_argument(
+        "--data-dir", default=os.path.join("data", "yfinance_data"),
+        help="Directory with the <TICKER>_historical_data.csv files",
+    )
+    parser.add_argument("--formats", nargs="+", default=["png"])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data_dir, "*_historical_data.csv")))
+    rendered = render_stock_charts(files, args.output_dir, args.formats, args.workers)
+    for file_path, paths in rendered.items():
+        print(f"{file_path}: {len(paths)} charts")
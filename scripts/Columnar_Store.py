@@ -0,0 +1,192 @@
+import argparse
+import glob
+import os
+import shutil
+from datetime import date, datetime
+
+import pandas as pd
+
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer
+
+# pyarrow is only needed for the columnar store; the CSV paths work without it
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover
+    pa = None
+    ds = None
+
+NEWS_CATEGORIES = ("publisher", "stock")
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The columnar store needs pyarrow: pip install pyarrow")
+
+
+def is_dataset(path):
+    """Return True if ``path`` points at a converted dataset directory."""
+    return os.path.isdir(path)
+
+
+def ticker_from_path(path):
+    """Return the ticker of a ``<TICKER>_historical_data.csv`` file."""
+    return os.path.basename(path).split("_")[0].upper()
+
+
+def _news_table(chunk, date_column, normalizer):
+    chunk = chunk.drop(columns=[c for c in chunk.columns if c.startswith("Unnamed")])
+    chunk[date_column] = normalizer.normalize(chunk[date_column])
+    chunk[OFFSET_COLUMN] = normalizer.last_offsets
+    # Sort on the parsed instants: raw strings in mixed formats/offsets are
+    # not in time order, and row-group min/max statistics need it
+    chunk = chunk.sort_values(date_column, kind="stable")
+    chunk["year"] = chunk[date_column].dt.year.astype("Int16")
+    for column in NEWS_CATEGORIES:
+        if column in chunk.columns:
+            chunk[column] = chunk[column].astype("category")
+    return pa.Table.from_pandas(chunk, preserve_index=False)
+
+
+def convert_news_csv(csv_path, dataset_dir, date_column="date", chunk_size=500_000):
+    """Convert a news CSV into a year-partitioned Parquet dataset.
+
+    Dates are stored parsed (UTC) with each row's original UTC offset in
+    ``utc_offset``, and publisher/stock are dictionary encoded. The CSV is
+    read in chunks, so the conversion runs in bounded memory; each chunk is
+    sorted by parsed date so row-group statistics allow date-range pruning.
+    Year partitions already in ``dataset_dir`` are replaced.
+    """
+    _require_pyarrow()
+    # Part files of an earlier, larger conversion would duplicate rows
+    for partition in glob.glob(os.path.join(dataset_dir, "year=*")):
+        shutil.rmtree(partition)
+    normalizer = DateNormalizer()
+    for part, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunk_size)):
+        ds.write_dataset(
+            _news_table(chunk, date_column, normalizer),
+            dataset_dir,
+            format="parquet",
+            partitioning=["year"],
+            partitioning_flavor="hive",
+            basename_template=f"part-{part}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=ROW_GROUP_SIZE,
+        )
+    return normalizer.stats
+
+
+def convert_price_csvs(csv_paths, dataset_dir):
+    """Convert ``<TICKER>_historical_data.csv`` files into one dataset
+    partitioned by ticker, with parsed dates."""
+    _require_pyarrow()
+    normalizer = DateNormalizer()
+    for csv_path in csv_paths:
+        prices = pd.read_csv(csv_path)
+        prices["Date"] = normalizer.normalize(prices["Date"]).dt.tz_localize(None)
+        prices = prices.sort_values("Date", kind="stable")
+        # Files disagree on int/float for some columns; one schema for all
+        value_columns = prices.columns.difference(["Date", "Volume"])
+        prices[value_columns] = prices[value_columns].astype("float64")
+        prices["ticker"] = ticker_from_path(csv_path)
+        ds.write_dataset(
+            pa.Table.from_pandas(prices, preserve_index=False),
+            dataset_dir,
+            format="parquet",
+            partitioning=["ticker"],
+            partitioning_flavor="hive",
+            existing_data_behavior="delete_matching",
+            max_rows_per_group=ROW_GROUP_SIZE,
+        )
+    return normalizer.stats
+
+
+def _is_date_only(value):
+    """True for a day without a time of day ("2020-06-30" or a ``date``)."""
+    if isinstance(value, str):
+        return ":" not in value
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+
+def _date_filter(field, start, end, tz=None):
+    expression = None
+    if start is not None:
+        expression = field >= pa.scalar(pd.Timestamp(start, tz=tz))
+    if end is not None:
+        if _is_date_only(end):
+            # A day as the end includes everything published during it
+            upper = field < pa.scalar(pd.Timestamp(end, tz=tz) + pd.Timedelta(days=1))
+        else:
+            upper = field <= pa.scalar(pd.Timestamp(end, tz=tz))
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def _and(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left & right
+
+
+def load_news(dataset_dir, tickers=None, start=None, end=None, columns=None,
+              date_column="date"):
+    """Load news rows for the given tickers and date range.
+
+    Filters are pushed down to the Parquet scan: whole year partitions and
+    row groups outside the range are skipped and only ``columns`` are read.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+    expression = _date_filter(ds.field(date_column), start, end, tz="UTC")
+    if start is not None:
+        expression = _and(expression, ds.field("year") >= pd.Timestamp(start).year)
+    if end is not None:
+        expression = _and(expression, ds.field("year") <= pd.Timestamp(end).year)
+    if tickers is not None:
+        expression = _and(expression, ds.field("stock").isin(list(tickers)))
+
+    if columns is not None:
+        columns = [c for c in columns if c != "year"]
+        # Publication days need the offset stored next to the UTC dates
+        if date_column in columns and OFFSET_COLUMN in dataset.schema.names:
+            columns.append(OFFSET_COLUMN)
+    table = dataset.to_table(columns=columns, filter=expression)
+    news_df = table.to_pandas()
+    return news_df.drop(columns=["year"], errors="ignore")
+
+
+def load_prices(dataset_dir, ticker, start=None, end=None, columns=None):
+    """Load the price history of one ticker, optionally within a date range."""
+    _require_pyarrow()
+    dataset = ds.dataset(dataset_dir, format="parquet", partitioning="hive")
+    expression = _and(
+        ds.field("ticker") == ticker.upper(),
+        _date_filter(ds.field("Date"), start, end),
+    )
+    table = dataset.to_table(columns=columns, filter=expression)
+    prices = table.to_pandas()
+    return prices.drop(columns=["ticker"], errors="ignore").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert news or price CSV files into Parquet datasets."
+    )
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+    news_parser = subparsers.add_parser("news")
+    news_parser.add_argument("csv_path")
+    news_parser.add_argument("dataset_dir")
+    news_parser.add_argument("--date-column", default="date")
+    prices_parser = subparsers.add_parser("prices")
+    prices_parser.add_argument("dataset_dir")
+    prices_parser.add_argument("csv_paths", nargs="+")
+    args = parser.parse_args()
+
+    if args.kind == "news":
+        stats = convert_news_csv(args.csv_path, args.dataset_dir, args.date_column)
+    else:
+        stats = convert_price_csvs(args.csv_paths, args.dataset_dir)
+    print("Rows parsed per date format:", stats)
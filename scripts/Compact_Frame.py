@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Low-cardinality news columns stored as categoricals (dictionary encoded)
+CATEGORY_COLUMNS = ("publisher", "stock", "domain", "sentiment")
+# Free-text columns stored as Arrow-backed strings
+STRING_COLUMNS = ("headline", "url")
+SENTIMENT_LABELS = ["Negative", "Neutral", "Positive"]
+
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype with NaN missing values (like object columns)."""
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except (TypeError, ImportError):  # pandas < 2.3 or no pyarrow
+        try:
+            return pd.StringDtype("pyarrow")
+        except ImportError:
+            return object
+
+
+def read_news_csv(path, compact=True, **kwargs):
+    """Read a news CSV, parsing the compact columns straight into their dtypes.
+
+    Reading publisher/stock as categoricals and text as Arrow strings avoids
+    ever holding the object-column version of the frame.
+    """
+    if compact:
+        string_dtype = _arrow_string_dtype()
+        dtype = {column: "category" for column in ("publisher", "stock")}
+        dtype.update({column: string_dtype for column in STRING_COLUMNS})
+        kwargs.setdefault("dtype", dtype)
+    return pd.read_csv(path, **kwargs)
+
+
+def compact_news_frame(news_df):
+    """Convert a news frame to its compact layout, in place, and return it.
+
+    Publisher, stock, domain and the sentiment label become categoricals,
+    headline and url Arrow-backed strings, and the polarity score float32.
+    Date columns are left as ``datetime64`` (int64 epoch values). Index
+    columns written by ``to_csv`` (``Unnamed: 0``) are downcast. Calling it
+    again on a compact frame is a no-op.
+    """
+    string_dtype = _arrow_string_dtype()
+    for column in news_df.columns:
+        values = news_df[column]
+        numeric = pd.api.types.is_numeric_dtype(values) and not isinstance(
+            values.dtype, pd.CategoricalDtype
+        )
+        if column == "sentiment_score" or (column == "sentiment" and numeric):
+            # CombinedAnalysis keeps the polarity itself in "sentiment"
+            news_df[column] = values.astype(np.float32)
+        elif column in CATEGORY_COLUMNS:
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                news_df[column] = values.cat.remove_unused_categories()
+            elif column == "sentiment":
+                news_df[column] = pd.Categorical(values, categories=SENTIMENT_LABELS)
+            else:
+                news_df[column] = values.astype("category")
+        elif column in STRING_COLUMNS and values.dtype != string_dtype:
+            news_df[column] = values.astype(string_dtype)
+        elif column.startswith("Unnamed") and pd.api.types.is_integer_dtype(values):
+            news_df[column] = pd.to_numeric(values, downcast="integer")
+    return news_df
+
+
+def value_counts(values):
+    """``values.value_counts()`` with the index and tie order of an object column.
+
+    Categorical value counts order ties by category and return a
+    CategoricalIndex; here ties keep first-appearance order and the index
+    holds plain labels, so compact and object frames give the same result.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.value_counts()
+    codes = values.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    order = pd.unique(codes)
+    counts = np.bincount(codes, minlength=len(values.cat.categories))[order]
+    index = pd.Index(np.asarray(values.cat.categories)[order], name=values.name)
+    counts = pd.Series(counts, index=index, name="count")
+    return counts.sort_values(ascending=False, kind="stable")
+
+
+def memory_report(frames):
+    """Deep memory use per column of the given ``{name: DataFrame}`` frames.
+
+    Returns one row per column (frame, column, dtype, megabytes) plus a
+    total row per frame.
+    """
+    rows = []
+    for name, frame in frames.items():
+        if frame is None:
+            continue
+        usage = frame.memory_usage(deep=True, index=True)
+        for column, size in usage.items():
+            dtype = frame.index.dtype if column == "Index" else frame[column].dtype
+            rows.append({"frame": name, "column": column, "dtype": str(dtype),
+                         "megabytes": size / 2**20})
+        rows.append({"frame": name, "column": "total", "dtype": "",
+                     "megabytes": usage.sum() / 2**20})
+    return pd.DataFrame(rows, columns=["frame", "column", "dtype", "megabytes"])
@@ -1,89 +1,274 @@
+import logging
 import os
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
 import seaborn as sns
 
+from scripts.Analysis_Graph import AnalysisGraph
+from scripts.Columnar_Store import is_dataset, load_news, load_prices
+from scripts.Compact_Frame import compact_news_frame, memory_report, read_news_csv
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer, local_time
+from scripts.News_Stream import NewsStream
+from scripts.Rolling_Correlation import rolling_lagged_correlation
+from scripts.Sentiment_Engine import SentimentEngine
+from scripts.Session_Alignment import (
+    CLOSE_TIME, EXCHANGE_TIMEZONE, align_to_sessions, join_on_sessions
+)
+
+logger = logging.getLogger(__name__)
+
 class CombinedAnalysis:
-    def __init__(self, news_file, stock_file):
+    """Daily news sentiment against the returns of one stock.
+
+    Every derived result is a lazily computed, cached node of an
+    ``AnalysisGraph``: news and stock inputs, the normalized dates, the
+    headline scores, daily sentiment, returns, the merged frame and the
+    correlation. The public methods ask the graph for their result, so any
+    of them can be called first and only missing nodes are computed.
+    Loading a new file with ``set_news_file``/``set_stock_file`` or changing
+    a parameter only invalidates the nodes downstream of it (a new price
+    file does not re-score the headlines).
+    """
+
+    def __init__(self, news_file, stock_file, chunk_size=None, ticker=None,
+                 start=None, end=None, compact=True, align_sessions=False,
+                 timezone=EXCHANGE_TIMEZONE, close_time=CLOSE_TIME):
+        self.chunk_size = chunk_size
+        self.ticker = ticker
+        self.start = start
+        self.end = end
+        self.compact = compact
+        # With align_sessions each headline counts for the trading session it
+        # can affect (after-close and weekend news roll forward) instead of
+        # its UTC calendar day
+        self.align_sessions = align_sessions
+        self.timezone = timezone
+        self.close_time = close_time
+        # Engine settings that do not change the scores (not graph inputs)
+        self.engine_options = {"n_workers": None, "chunk_size": 5000, "cache_path": None}
+        self.graph = self._build_graph()
+        self.set_stock_file(stock_file)
+        self.set_news_file(news_file)
+
+        # Log columns for debugging
+        if self.news_df is not None:
+            logger.debug("News DataFrame columns: %s", self.news_df.columns)
+        logger.debug("Stock DataFrame columns: %s", self.stock_df.columns)
+
+    def _build_graph(self):
+        graph = AnalysisGraph()
+        graph.input("news_file")
+        graph.input("news")
+        graph.input("stock")
+        graph.input("backend", "textblob")
+        graph.input("rolling_params")
+        graph.node("news_dates", self._news_dates, ["news"])
+        graph.node("stock_dates", self._stock_dates, ["stock"])
+        if self.align_sessions:
+            graph.node("news_days", self._news_sessions, ["news_dates", "stock_dates"])
+        else:
+            graph.node("news_days", lambda news: news, ["news_dates"])
+        graph.node("scores", self._scores, ["news", "backend"])
+        graph.node(
+            "daily_sentiment", self._daily_sentiment,
+            ["news_file", "news_days", "scores", "backend"],
+        )
+        graph.node("returns", self._returns, ["stock_dates"])
+        graph.node("merged", self._merged, ["returns", "daily_sentiment"])
+        graph.node("correlation", self._correlation, ["merged"])
+        graph.node("rolling", self._rolling, ["returns", "daily_sentiment", "rolling_params"])
+        return graph
+
+    def set_news_file(self, news_file):
+        """Load a news file; cached results downstream of the news are dropped."""
         self.news_file = news_file
+        # With a chunk size the news file is streamed during analyze_sentiment
+        # instead of being loaded here
+        self.news_df = None
+        if is_dataset(news_file):
+            tickers = [self.ticker] if self.ticker is not None else None
+            self.news_df = load_news(
+                news_file, tickers=tickers, start=self.start, end=self.end, date_column="Date"
+            )
+        elif self.chunk_size is None:
+            self.news_df = read_news_csv(news_file, self.compact)
+        if self.compact and self.news_df is not None:
+            compact_news_frame(self.news_df)
+        self.graph.set("news_file", news_file)
+        self.graph.set("news", self.news_df)
+
+    def set_stock_file(self, stock_file):
+        """Load a price file; only the date, return and joined results are dropped."""
         self.stock_file = stock_file
-        self.news_df = pd.read_csv(news_file)
-        self.stock_df = pd.read_csv(stock_file)
-        
-        # Print columns for debugging
-        print("News DataFrame columns:", self.news_df.columns)
-        print("Stock DataFrame columns:", self.stock_df.columns)
+        if is_dataset(stock_file):
+            self.stock_df = load_prices(stock_file, self.ticker, self.start, self.end)
+        else:
+            self.stock_df = pd.read_csv(stock_file)
+        self.graph.set("stock", self.stock_df)
 
     def normalize_dates(self):
-        # Print available columns for debugging
-        print("Available columns in news_df:", self.news_df.columns)
-        print("Available columns in stock_df:", self.stock_df.columns)
-        
-        try:
-            # Try parsing with the format that includes seconds and timezone offset
-            self.news_df['Date'] = pd.to_datetime(
-                self.news_df['Date'], format='%Y-%m-%d %H:%M:%S%z', errors='coerce'
-            )
+        if self.news_df is not None:
+            self.news_df = self.graph.get("news_days")
+        self.stock_df = self.graph.get("stock_dates")
 
-            # Handle the format with only hour and minute
-            self.news_df['Date'] = self.news_df['Date'].fillna(
-                pd.to_datetime(self.news_df['Date'], format='%m/%d/%Y %H:%M', errors='coerce')
-            )
+    def _news_dates(self, news):
+        if news is None:
+            return None
+        # Log available columns for debugging
+        logger.debug("Available columns in news_df: %s", news.columns)
 
-            # Handle any remaining formats using a generalized datetime parser
-            self.news_df['Date'] = self.news_df['Date'].fillna(
-                pd.to_datetime(self.news_df['Date'], errors='coerce')
-            )
+        try:
+            # Detect each row's format and parse every format group once (UTC)
+            normalizer = DateNormalizer()
+            dates = normalizer.normalize(news['Date'], news.get(OFFSET_COLUMN))
+            self.date_stats = normalizer.last_stats
+            logger.debug("Rows parsed per date format: %s", self.date_stats)
 
-            # Convert to just the date part
-            self.news_df['Date'] = self.news_df['Date'].dt.date
+            if self.align_sessions:
+                # Keep the full timestamp until the trading days are known
+                news = news.assign(Date=dates, Timestamp=dates)
+            else:
+                # Convert to just the date part, in the offset each
+                # headline was published with (not the UTC calendar day)
+                news = news.assign(Date=local_time(dates, normalizer.last_offsets).dt.date)
 
         except ValueError as e:
-            print(f"Error parsing date in news_df: {e}")
+            logger.error("Error parsing date in news_df: %s", e)
             raise
-        
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized News Dates:\n%s", news['Date'].head())
+        return news
+
+    def _stock_dates(self, stock):
+        # Log available columns for debugging
+        logger.debug("Available columns in stock_df: %s", stock.columns)
+
         try:
             # Parse the dates in the stock_df using mixed format
-            self.stock_df['Date'] = pd.to_datetime(self.stock_df['Date'], format='mixed').dt.date
+            stock = stock.assign(Date=pd.to_datetime(stock['Date'], format='mixed').dt.date)
 
         except ValueError as e:
-            print(f"Error parsing date in stock_df: {e}")
+            logger.error("Error parsing date in stock_df: %s", e)
             raise
 
-        # Print to verify that dates have been normalized correctly
-        print("Normalized News Dates:\n", self.news_df['Date'].head())
-        print("Normalized Stock Dates:\n", self.stock_df['Date'].head())
+        # Log to verify that dates have been normalized correctly
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized Stock Dates:\n%s", stock['Date'].head())
+        return stock
+
+    def _news_sessions(self, news, stock):
+        if news is None:
+            return None
+        # Session day of every headline from the trading days in the price file
+        sessions, self.session_stats = align_to_sessions(
+            news['Timestamp'], stock['Date'],
+            timezone=self.timezone, close_time=self.close_time,
+        )
+        logger.debug("Rows per session rule: %s", self.session_stats)
+        return news.assign(Date=sessions)
+
+    def analyze_sentiment(self, n_workers=None, chunk_size=5000, cache_path=None,
+                          backend="textblob"):
+        self.engine_options = {
+            "n_workers": n_workers, "chunk_size": chunk_size, "cache_path": cache_path,
+        }
+        self.graph.set("backend", backend)
+        return self.graph.get("daily_sentiment")
 
-    def analyze_sentiment(self):
-        # Perform sentiment analysis on each headline
-        def get_sentiment(text):
-            analysis = TextBlob(text)
-            return analysis.sentiment.polarity
+    def _scores(self, news, backend):
+        if news is None:
+            return None
+        # Perform sentiment analysis on the headlines in parallel chunks,
+        # reusing scores from the on-disk cache when a path is given
+        engine = SentimentEngine(backend=backend, **self.engine_options)
+        polarity = engine.score(news["headline"])
+        self.sentiment_cache_stats = engine.last_cache_stats
+        engine.close()
+        return polarity
 
-        self.news_df["sentiment"] = self.news_df["headline"].apply(get_sentiment)
+    def _daily_sentiment(self, news_file, news, scores, backend):
+        if news is None:
+            # Streaming mode: score and aggregate the news file chunk by chunk
+            stream = NewsStream(
+                news_file, chunk_size=self.chunk_size, date_column="Date",
+                n_workers=self.engine_options["n_workers"],
+                cache_path=self.engine_options["cache_path"], backend=backend,
+            )
+            self.daily_sentiment = stream.run().daily_sentiment()
+            return self.daily_sentiment
+
+        # The compact frame keeps float32 scores; the daily means use the
+        # float64 scores, so correlations match the plain layout exactly
+        stored = scores.astype(np.float32) if self.compact else scores
+        self.news_df = news.assign(sentiment=stored)
 
         # Aggregate sentiment scores by date
         self.daily_sentiment = (
-            self.news_df.groupby("Date")["sentiment"].mean().reset_index()
+            pd.Series(scores, index=news.index, name="sentiment")
+            .groupby(news["Date"]).mean().reset_index()
         )
+        if self.align_sessions:
+            # Session days as dates, like the stock Date column
+            self.daily_sentiment["Date"] = self.daily_sentiment["Date"].dt.date
         return self.daily_sentiment
 
+    def memory_report(self):
+        """Memory used by each column of the news and stock frames, in megabytes."""
+        return memory_report({"news": self.news_df, "stock": self.stock_df})
+
     def calculate_daily_returns(self):
-        # Calculate daily percentage returns in stock data
-        self.stock_df["Daily_Return"] = self.stock_df["Close"].pct_change()
+        self.stock_df = self.graph.get("returns")
         return self.stock_df[["Date", "Close", "Daily_Return"]]
 
+    def _returns(self, stock):
+        # Calculate daily percentage returns in stock data
+        self.stock_df = stock.assign(Daily_Return=stock["Close"].pct_change())
+        return self.stock_df
+
     def correlate_with_sentiment(self):
+        return self.graph.get("correlation"), self.graph.get("merged")
+
+    def _merged(self, stock, daily_sentiment):
+        if self.align_sessions:
+            # Sorted join on int64 session keys
+            return join_on_sessions(stock, daily_sentiment)
         # Merge stock data with sentiment data on date
-        merged_df = pd.merge(
-            self.stock_df,
-            self.daily_sentiment,
+        return pd.merge(
+            stock,
+            daily_sentiment,
             left_on="Date",
             right_on="Date",
             how="inner",
         )
 
+    def _correlation(self, merged_df):
         # Calculate Pearson correlation between daily returns and sentiment
-        correlation = merged_df["Daily_Return"].corr(merged_df["sentiment"])
-        return correlation, merged_df
-    
\ No newline at end of file
+        return merged_df["Daily_Return"].corr(merged_df["sentiment"])
+
+    def rolling_lagged_correlations(self, windows=(30, 90, 250), lags=(0, 1, 2, 3, 4, 5),
+                                    min_periods=None):
+        """Rolling correlations of daily sentiment at t with returns at t+lag.
+
+        Lags and windows are counted in trading days of the stock file.
+        Returns one tidy frame with Date, window, lag, correlation and
+        observations.
+        """
+        self.graph.set("rolling_params", {
+            "windows": tuple(windows), "lags": tuple(lags), "min_periods": min_periods,
+        })
+        return self.graph.get("rolling")
+
+    def _rolling(self, stock, daily_sentiment, params):
+        # Keep every trading day so lags step from one session to the next
+        aligned = pd.merge(
+            stock[["Date", "Daily_Return"]],
+            daily_sentiment,
+            on="Date",
+            how="left",
+        )
+        return rolling_lagged_correlation(
+            aligned["Date"], aligned["sentiment"], aligned["Daily_Return"],
+            windows=params["windows"], lags=params["lags"],
+            min_periods=params["min_periods"],
+        )
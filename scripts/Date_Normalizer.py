@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+# (name, cheap shape check, explicit strptime format) in detection order
+DATE_FORMATS = [
+    ("iso_offset", r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}[+-]\d{2}:?\d{2}$", "%Y-%m-%d %H:%M:%S%z"),
+    ("iso_seconds", r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", "%Y-%m-%d %H:%M:%S"),
+    ("us_minute", r"^\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}$", "%m/%d/%Y %H:%M"),
+    ("iso_date", r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d"),
+    ("us_date", r"^\d{1,2}/\d{1,2}/\d{4}$", "%m/%d/%Y"),
+]
+FALLBACK = "fallback"
+UNPARSED = "unparsed"
+PARSED = "datetime"
+FORMAT_NAMES = [name for name, _, _ in DATE_FORMATS] + [FALLBACK, UNPARSED]
+NAT = np.iinfo(np.int64).min
+# Column holding each row's original UTC offset in minutes (news frames, datasets)
+OFFSET_COLUMN = "utc_offset"
+
+
+def local_time(timestamps, offsets):
+    """Naive wall-clock time of UTC ``timestamps`` in their original offsets.
+
+    ``offsets`` are minutes east of UTC per row (see
+    ``DateNormalizer.last_offsets``). Days and months taken from the result
+    are the publication dates as written, not the UTC calendar day.
+    """
+    timestamps = pd.Series(timestamps)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    shift = pd.to_timedelta(np.asarray(offsets, dtype=np.int64), unit="min")
+    return timestamps + shift
+
+
+def _fallback_offset(string):
+    # Offset of a string only the generic parser understood (rare path)
+    try:
+        offset = pd.Timestamp(string).utcoffset()
+    except (ValueError, TypeError, OverflowError):
+        return 0
+    return 0 if offset is None else int(offset.total_seconds() // 60)
+
+
+class DateNormalizer:
+    """Parse a column of mixed-format date strings into UTC timestamps.
+
+    Only the distinct strings are parsed: each one is assigned to a format
+    with a vectorized regex check, every format group is parsed once with
+    its explicit format, and anything left goes through the generic parser.
+    Parsed strings are memoized across calls (e.g. across stream chunks).
+    Naive timestamps are taken to be UTC.
+
+    The UTC offset each string was written with is kept in
+    ``last_offsets`` (minutes, 0 for naive strings), so callers can take
+    days and months in the publication's own offset with ``local_time``.
+    """
+
+    def __init__(self, max_cache=1_000_000):
+        self.max_cache = max_cache
+        self._clear_cache()
+        self.last_stats = {}
+        self.last_offsets = np.empty(0, dtype=np.int16)
+        self.stats = {}
+
+    def _clear_cache(self):
+        # Memo of parsed strings: keys with their epoch ns and format id
+        self._cache_keys = pd.Index([], dtype="object")
+        self._cache_nanos = np.empty(0, dtype=np.int64)
+        self._cache_formats = np.empty(0, dtype=np.int8)
+        self._cache_offsets = np.empty(0, dtype=np.int16)
+
+    def _parse_uniques(self, uniques):
+        strings = pd.Series(uniques, dtype="object").astype(str).str.strip()
+        parsed = pd.Series(pd.NaT, index=strings.index, dtype="datetime64[ns, UTC]")
+        formats = np.full(len(strings), FORMAT_NAMES.index(FALLBACK), dtype=np.int8)
+        offsets = np.zeros(len(strings), dtype=np.int16)
+        pending = np.ones(len(strings), dtype=bool)
+
+        for format_id, (_, pattern, fmt) in enumerate(DATE_FORMATS):
+            match = pending.copy()
+            match[pending] = strings[pending].str.match(pattern).to_numpy(dtype=bool)
+            if match.any():
+                parsed[match], offsets[match] = self._parse_format(strings[match], fmt)
+                formats[match] = format_id
+                pending &= ~match
+
+        # Generic parser only for strings no explicit format recognised
+        if pending.any():
+            parsed[pending] = pd.to_datetime(
+                strings[pending], format="mixed", errors="coerce", utc=True
+            ).dt.as_unit("ns")
+            offsets[pending] = [_fallback_offset(string) for string in strings[pending]]
+
+        unparsed = parsed.isna().to_numpy()
+        formats[unparsed] = FORMAT_NAMES.index(UNPARSED)
+        offsets[unparsed] = 0
+        return parsed.array.asi8, formats, offsets
+
+    def _parse_format(self, strings, fmt):
+        """UTC timestamps and UTC offsets (minutes) of strings in one format."""
+        if fmt.endswith("%z"):
+            # Parsing %z element by element is slow: parse the fixed-width
+            # local part, then shift by the (few distinct) UTC offsets
+            width = len(pd.Timestamp(2000, 1, 1).strftime(fmt[:-2]))
+            local = pd.to_datetime(
+                strings.str.slice(0, width), format=fmt[:-2], errors="coerce"
+            )
+            offset_codes, offsets = pd.factorize(strings.str.slice(width))
+            minutes = np.array(
+                [(-1 if o[0] == "-" else 1) * (int(o[1:3]) * 60 + int(o[-2:])) for o in offsets]
+            )
+            shift = pd.to_timedelta(minutes[offset_codes], unit="min")
+            parsed = (local - shift).dt.tz_localize("UTC").dt.as_unit("ns")
+            return parsed, minutes[offset_codes].astype(np.int16)
+
+        parsed = pd.to_datetime(strings, format=fmt, errors="coerce", utc=True).dt.as_unit("ns")
+        return parsed, np.zeros(len(strings), dtype=np.int16)
+
+    def normalize(self, values, offsets=None):
+        """Return a tz-aware UTC Series aligned with ``values``.
+
+        ``offsets`` gives the original UTC offsets of already parsed values
+        (the ``utc_offset`` column of a converted dataset).
+        """
+        values = pd.Series(values)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return self._normalize_parsed(values, offsets)
+
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Index(uniques, dtype="object")
+
+        # Parse only the distinct strings we have not seen before
+        if len(self._cache_keys):
+            positions = self._cache_keys.get_indexer(uniques)
+        else:
+            positions = np.full(len(uniques), -1, dtype=np.intp)
+        is_missing = positions < 0
+        if is_missing.any():
+            if len(self._cache_keys) + is_missing.sum() > self.max_cache:
+                self._clear_cache()
+                is_missing[:] = True
+            missing = uniques[is_missing]
+            nanos, formats, offsets = self._parse_uniques(missing)
+            positions[is_missing] = len(self._cache_keys) + np.arange(len(missing))
+            self._cache_keys = self._cache_keys.append(missing)
+            self._cache_nanos = np.concatenate([self._cache_nanos, nanos])
+            self._cache_formats = np.concatenate([self._cache_formats, formats])
+            self._cache_offsets = np.concatenate([self._cache_offsets, offsets])
+
+        # Extra trailing slot for missing values (factorize code -1)
+        nanos = np.append(self._cache_nanos[positions], NAT)
+        result = pd.Series(
+            pd.DatetimeIndex(nanos[codes].view("datetime64[ns]")).tz_localize("UTC"),
+            index=values.index,
+            name=values.name,
+        )
+        self.last_offsets = np.append(self._cache_offsets[positions], 0).astype(np.int16)[codes]
+
+        # Rows handled by each format
+        formats = np.append(self._cache_formats[positions], FORMAT_NAMES.index(UNPARSED))
+        rows = np.bincount(formats[codes], minlength=len(FORMAT_NAMES))
+        self._record({
+            name: int(count) for name, count in zip(FORMAT_NAMES, rows) if count
+        })
+        return result
+
+    def _normalize_parsed(self, values, offsets=None):
+        # Already parsed (e.g. loaded from the columnar store): only align to UTC
+        if values.dt.tz is None:
+            result = values.dt.tz_localize("UTC")
+        else:
+            result = values.dt.tz_convert("UTC")
+        if offsets is None:
+            # A tz-aware column carries its offset; naive ones count as UTC
+            wall = values.dt.tz_localize(None) if values.dt.tz is not None else values
+            offsets = (wall - result.dt.tz_localize(None)) // pd.Timedelta(minutes=1)
+        self.last_offsets = np.asarray(pd.Series(offsets).fillna(0), dtype=np.int16)
+        self._record({PARSED: len(values)})
+        return result.dt.as_unit("ns")
+
+    def local(self, values, offsets=None):
+        """Parse ``values`` and return their naive wall-clock times in the
+        UTC offset each was written with (see ``local_time``)."""
+        return local_time(self.normalize(values, offsets), self.last_offsets)
+
+    def _record(self, stats):
+        self.last_stats = stats
+        for name, rows in stats.items():
+            self.stats[name] = self.stats.get(name, 0) + rows
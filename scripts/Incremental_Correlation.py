@@ -0,0 +1,171 @@
+import json
+import math
+
+import pandas as pd
+
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer
+from scripts.Sentiment_Engine import SentimentEngine
+
+
+class IncrementalCorrelation:
+    """Running state for daily sentiment, daily returns and their correlation.
+
+    Mirrors ``CombinedAnalysis`` (mean headline polarity per day, close-to-
+    close returns per ticker, Pearson correlation on the days both exist),
+    but keeps only sums: per-day sentiment sums/counts, the last close per
+    ticker and the Pearson accumulators (n, Σx, Σy, Σxy, Σx², Σy²) per
+    ticker. Applying a delta costs time proportional to the delta, and the
+    state can be saved to and loaded from a JSON file between runs.
+    """
+
+    def __init__(self):
+        self.sentiment_sum = {}    # day -> sum of polarity
+        self.sentiment_count = {}  # day -> number of headlines
+        self.last_close = {}       # ticker -> (day, close)
+        self.returns = {}          # ticker -> {day: daily return}
+        self.accumulators = {}     # ticker -> [n, sx, sy, sxy, sxx, syy]
+
+    def _mean_sentiment(self, day):
+        count = self.sentiment_count.get(day)
+        return self.sentiment_sum[day] / count if count else None
+
+    def _update_pair(self, ticker, x, y, sign):
+        acc = self.accumulators.setdefault(ticker, [0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        acc[0] += sign
+        acc[1] += sign * x
+        acc[2] += sign * y
+        acc[3] += sign * x * y
+        acc[4] += sign * x * x
+        acc[5] += sign * y * y
+
+    def apply_news(self, news_df, date_column="Date", engine=None):
+        """Fold new headlines into the state.
+
+        ``news_df`` needs a date column and either a ``sentiment`` polarity
+        column or a ``headline`` column to score. Already parsed dates (such
+        as ``load_news`` output) use its ``utc_offset`` column.
+        """
+        # Publication days in each headline's own UTC offset
+        days = DateNormalizer().local(news_df[date_column], news_df.get(OFFSET_COLUMN)).dt.date
+        if "sentiment" in news_df.columns:
+            sentiment = news_df["sentiment"].to_numpy()
+        else:
+            engine = engine or SentimentEngine()
+            sentiment = engine.score(news_df["headline"])
+
+        delta = pd.DataFrame({"day": days, "sentiment": sentiment}).dropna()
+        daily = delta.groupby("day")["sentiment"].agg(["sum", "count"])
+
+        for day, row in daily.iterrows():
+            old_mean = self._mean_sentiment(day)
+            self.sentiment_sum[day] = self.sentiment_sum.get(day, 0.0) + row["sum"]
+            self.sentiment_count[day] = self.sentiment_count.get(day, 0) + int(row["count"])
+            new_mean = self._mean_sentiment(day)
+
+            # Swap the day's old sentiment for the new one in every pair
+            for ticker, returns in self.returns.items():
+                if day in returns:
+                    if old_mean is not None:
+                        self._update_pair(ticker, returns[day], old_mean, -1)
+                    self._update_pair(ticker, returns[day], new_mean, +1)
+
+    def apply_prices(self, ticker, prices_df):
+        """Fold new price bars of one ticker into the state. Bars on or before
+        the last stored day are ignored."""
+        prices = pd.DataFrame({
+            "day": pd.to_datetime(prices_df["Date"], format="mixed").dt.date,
+            "Close": prices_df["Close"].to_numpy(),
+        }).sort_values("day")
+
+        returns = self.returns.setdefault(ticker, {})
+        last_day, last_close = self.last_close.get(ticker, (None, None))
+        for day, close in zip(prices["day"], prices["Close"]):
+            if last_day is not None and day <= last_day:
+                continue
+            if last_close is not None:
+                daily_return = close / last_close - 1
+                returns[day] = daily_return
+                sentiment = self._mean_sentiment(day)
+                if sentiment is not None:
+                    self._update_pair(ticker, daily_return, sentiment, +1)
+            last_day, last_close = day, close
+        self.last_close[ticker] = (last_day, last_close)
+
+    def daily_sentiment(self):
+        """Mean sentiment per day, shaped like ``CombinedAnalysis.daily_sentiment``."""
+        days = sorted(self.sentiment_sum)
+        return pd.DataFrame({
+            "Date": days,
+            "sentiment": [self._mean_sentiment(day) for day in days],
+        })
+
+    def daily_returns(self, ticker):
+        """Daily returns of one ticker."""
+        returns = self.returns.get(ticker, {})
+        days = sorted(returns)
+        return pd.DataFrame({"Date": days, "Daily_Return": [returns[d] for d in days]})
+
+    def correlation(self, ticker):
+        """Pearson correlation between daily returns and daily sentiment."""
+        n, sx, sy, sxy, sxx, syy = self.accumulators.get(ticker, [0] * 6)
+        if n < 2:
+            return float("nan")
+        covariance = n * sxy - sx * sy
+        variance = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        if variance <= 0:
+            return float("nan")
+        return covariance / math.sqrt(variance)
+
+    def correlations(self):
+        """Correlation and number of paired days for every ticker."""
+        return pd.DataFrame(
+            [
+                {"ticker": ticker, "correlation": self.correlation(ticker),
+                 "observations": int(self.accumulators.get(ticker, [0])[0])}
+                for ticker in self.returns
+            ]
+        ).set_index("ticker")
+
+    def save(self, path):
+        """Write the state to a JSON file."""
+        state = {
+            "sentiment": {
+                day.isoformat(): [self.sentiment_sum[day], self.sentiment_count[day]]
+                for day in self.sentiment_sum
+            },
+            "last_close": {
+                ticker: [day.isoformat(), close]
+                for ticker, (day, close) in self.last_close.items()
+            },
+            "returns": {
+                ticker: {day.isoformat(): value for day, value in returns.items()}
+                for ticker, returns in self.returns.items()
+            },
+            "accumulators": self.accumulators,
+        }
+        with open(path, "w") as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a state written by :meth:`save`."""
+        with open(path) as f:
+            state = json.load(f)
+
+        def to_day(text):
+            return pd.Timestamp(text).date()
+
+        incremental = cls()
+        for day, (total, count) in state["sentiment"].items():
+            incremental.sentiment_sum[to_day(day)] = total
+            incremental.sentiment_count[to_day(day)] = count
+        incremental.last_close = {
+            ticker: (to_day(day), close)
+            for ticker, (day, close) in state["last_close"].items()
+        }
+        incremental.returns = {
+            ticker: {to_day(day): value for day, value in returns.items()}
+            for ticker, returns in state["returns"].items()
+        }
+        incremental.accumulators = state["accumulators"]
+        return incremental
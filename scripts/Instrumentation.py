@@ -0,0 +1,163 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Instance attributes holding the frames an analysis class works on
+FRAME_ATTRIBUTES = ("df", "news_df", "stock_df")
+
+
+def _frame_rows(instance):
+    """Total rows of the frames held by an analysis instance."""
+    rows = 0
+    for name in FRAME_ATTRIBUTES:
+        frame = getattr(instance, name, None)
+        if isinstance(frame, (pd.DataFrame, pd.Series)):
+            rows += len(frame)
+    return rows
+
+
+def _result_rows(result):
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    if isinstance(result, tuple):
+        sizes = [len(item) for item in result if isinstance(item, (pd.DataFrame, pd.Series))]
+        return max(sizes) if sizes else None
+    return None
+
+
+class Profiler:
+    """Opt-in stage profiler for the analysis classes.
+
+    ``profiler.create(CombinedAnalysis, news_file, stock_file)`` builds an
+    instance (timing the constructor, which loads the data) and wraps its
+    public methods; ``profiler.attach(instance)`` wraps an existing one.
+    Every call records wall time, CPU time, the rows held by the instance
+    and by the result and, with ``trace_memory``, the peak traced memory
+    above the level at entry. Nested calls (a public method calling
+    another) are recorded with their depth. Nothing is wrapped unless a
+    profiler is attached, so uninstrumented instances pay no cost.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._origin = time.perf_counter()
+        self._stack = []
+
+    def _enter(self):
+        frame = {"peak": 0, "current": 0}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                frame["owns_tracing"] = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Keep the caller's peak before resetting it for this call
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["current"] = current
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame):
+        self._stack.pop()
+        if not self.trace_memory:
+            return None
+        peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        if frame.get("owns_tracing"):
+            tracemalloc.stop()
+        return max(0, peak - frame["current"])
+
+    def measure(self, name, function, *args, instance=None, **kwargs):
+        """Call ``function`` and record one entry named ``name``."""
+        depth = len(self._stack)
+        frame = self._enter()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            cpu_seconds = time.process_time() - cpu_start
+            peak = self._exit(frame)
+
+        record = {
+            "name": name,
+            "depth": depth,
+            "start": start - self._origin,
+            "seconds": seconds,
+            "cpu_seconds": cpu_seconds,
+            "rows": _frame_rows(instance) if instance is not None else None,
+            "result_rows": _result_rows(result),
+            "peak_mb": None if peak is None else peak / 2**20,
+            "thread": threading.get_ident(),
+        }
+        self.records.append(record)
+        logger.debug("%s took %.3fs (cpu %.3fs, rows %s)", name, seconds, cpu_seconds, record["rows"])
+        return result
+
+    def attach(self, instance):
+        """Wrap every public method of ``instance`` and return the instance."""
+        class_name = type(instance).__name__
+        for name, method in inspect.getmembers(instance, inspect.ismethod):
+            if name.startswith("_"):
+                continue
+            setattr(instance, name, self._wrap(instance, f"{class_name}.{name}", method))
+        return instance
+
+    def _wrap(self, instance, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            return self.measure(name, method, *args, instance=instance, **kwargs)
+        return wrapper
+
+    def create(self, cls, *args, **kwargs):
+        """Construct ``cls(*args, **kwargs)`` with the constructor timed, then attach."""
+        instance = cls.__new__(cls)
+        self.measure(f"{cls.__name__}.__init__", instance.__init__, *args, instance=instance, **kwargs)
+        return self.attach(instance)
+
+    def report(self):
+        """One row per recorded call, in call order."""
+        columns = ["name", "depth", "start", "seconds", "cpu_seconds", "rows",
+                   "result_rows", "peak_mb"]
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(self.records)[columns].sort_values("start", ignore_index=True)
+
+    def chrome_trace(self):
+        """The records as Chrome trace events (open in chrome://tracing or Perfetto)."""
+        events = []
+        for record in self.records:
+            events.append({
+                "name": record["name"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["seconds"] * 1e6,
+                "pid": os.getpid(),
+                "tid": record["thread"],
+                "args": {
+                    key: record[key]
+                    for key in ("cpu_seconds", "rows", "result_rows", "peak_mb")
+                    if record[key] is not None
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Write the Chrome trace JSON to ``path``."""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
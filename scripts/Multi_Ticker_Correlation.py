@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from scripts.Columnar_Store import is_dataset, load_news, load_prices, ticker_from_path
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer
+from scripts.Rolling_Correlation import rolling_lagged_correlation
+from scripts.Sentiment_Engine import SentimentEngine
+
+
+class MultiTickerAnalysis:
+    """Correlate news sentiment with returns for many tickers at once.
+
+    The news file is loaded, date-normalized and scored a single time; daily
+    sentiment is then split by the news ``stock`` column and compared with
+    the returns of every price file.
+    """
+
+    def __init__(self, news_file, stock_files, tickers=None, date_column="Date",
+                 n_workers=None):
+        self.news_file = news_file
+        self.date_column = date_column
+        self.n_workers = n_workers
+
+        # Price inputs: a columnar dataset with a ticker list, a dict of
+        # {ticker: csv path}, or a list of <TICKER>_historical_data.csv files
+        if isinstance(stock_files, str) and is_dataset(stock_files):
+            if tickers is None:
+                raise ValueError("tickers is required when the prices are a columnar dataset.")
+            self.stock_files = {ticker: stock_files for ticker in tickers}
+        elif isinstance(stock_files, dict):
+            self.stock_files = dict(stock_files)
+        else:
+            self.stock_files = {ticker_from_path(path): path for path in stock_files}
+        self.tickers = list(self.stock_files)
+
+        if is_dataset(news_file):
+            self.news_df = load_news(
+                news_file, tickers=self.tickers, date_column=date_column,
+                columns=["headline", date_column, "stock"],
+            )
+        else:
+            self.news_df = pd.read_csv(
+                news_file, usecols=["headline", date_column, "stock"]
+            )
+        in_universe = self.news_df["stock"].isin(self.tickers)
+        self.news_df = self.news_df[in_universe].reset_index(drop=True)
+
+        self.date_stats = None  # set once normalize_dates has run
+        self.daily_sentiment = None
+        self.returns = None
+        self.merged = {}
+
+    def normalize_dates(self):
+        normalizer = DateNormalizer()
+        # Publication days in each headline's own UTC offset
+        self.news_df["Date"] = normalizer.local(
+            self.news_df[self.date_column], self.news_df.get(OFFSET_COLUMN)
+        ).dt.date
+        self.date_stats = normalizer.last_stats
+        return self.date_stats
+
+    def analyze_sentiment(self, n_workers=None, chunk_size=5000, cache_path=None,
+                          backend="textblob"):
+        """Score every headline once and return daily sentiment per ticker
+        (dates as rows, tickers as columns)."""
+        engine = SentimentEngine(
+            n_workers=n_workers, chunk_size=chunk_size, cache_path=cache_path,
+            backend=backend,
+        )
+        self.news_df["sentiment"] = engine.score(self.news_df["headline"])
+        engine.close()
+
+        self.daily_sentiment = (
+            self.news_df.groupby(["Date", "stock"], observed=True)["sentiment"]
+            .mean()
+            .unstack("stock")
+            .reindex(columns=self.tickers)
+        )
+        return self.daily_sentiment
+
+    def _load_prices(self, ticker, path):
+        if is_dataset(path):
+            prices = load_prices(path, ticker, columns=["Date", "Close"])
+        else:
+            prices = pd.read_csv(path, usecols=["Date", "Close"])
+        prices["Date"] = pd.to_datetime(prices["Date"], format="mixed").dt.date
+        prices["ticker"] = ticker
+        return prices
+
+    def calculate_daily_returns(self):
+        """Return daily returns of all tickers in one wide frame."""
+        prices = pd.concat(
+            [self._load_prices(ticker, path) for ticker, path in self.stock_files.items()],
+            ignore_index=True,
+        )
+        # Returns are taken within each ticker's own trading history
+        prices["Daily_Return"] = prices.groupby("ticker")["Close"].pct_change()
+        self.returns = prices.pivot(
+            index="Date", columns="ticker", values="Daily_Return"
+        ).reindex(columns=self.tickers)
+        return self.returns
+
+    def _correlate_ticker(self, ticker):
+        merged_df = pd.merge(
+            self.returns[ticker].dropna().rename("Daily_Return").reset_index(),
+            self.daily_sentiment[ticker].dropna().rename("sentiment").reset_index(),
+            on="Date",
+            how="inner",
+        )
+        correlation = merged_df["Daily_Return"].corr(merged_df["sentiment"])
+        return ticker, correlation, merged_df
+
+    def correlate_with_sentiment(self):
+        """Return a per-ticker table of Pearson correlations between daily
+        returns and that ticker's daily news sentiment."""
+        with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+            results = list(pool.map(self._correlate_ticker, self.tickers))
+
+        rows = []
+        for ticker, correlation, merged_df in results:
+            self.merged[ticker] = merged_df
+            rows.append({
+                "ticker": ticker,
+                "correlation": correlation,
+                "observations": len(merged_df),
+            })
+        return pd.DataFrame(rows).set_index("ticker")
+
+    def rolling_lagged_correlations(self, windows=(30, 90, 250), lags=(0, 1, 2, 3, 4, 5),
+                                    min_periods=None):
+        """Rolling/lagged correlations for every ticker in one tidy frame."""
+        frames = []
+        for ticker in self.tickers:
+            returns = self.returns[ticker].dropna()
+            sentiment = self.daily_sentiment[ticker].reindex(returns.index)
+            frame = rolling_lagged_correlation(
+                returns.index, sentiment, returns,
+                windows=windows, lags=lags, min_periods=min_periods,
+            )
+            frames.append(frame.assign(ticker=ticker))
+        return pd.concat(frames, ignore_index=True)
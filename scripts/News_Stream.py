@@ -0,0 +1,103 @@
+import pandas as pd
+
+from scripts.Date_Normalizer import DateNormalizer
+from scripts.Sentiment_Engine import SentimentEngine
+
+
+class NewsStream:
+    """Read a news CSV in fixed-size chunks and keep running aggregates.
+
+    Each chunk is parsed and folded into the per-publisher and monthly
+    counts and, when sentiment is asked for, scored into the daily
+    sentiment sums and counts, then dropped. Memory therefore depends on
+    ``chunk_size`` and the number of distinct days/publishers, not on the
+    length of the file. Headlines are only scored by ``daily_sentiment``
+    (or ``run(sentiment=True)``), so counting publishers never pays for
+    scoring; a later sentiment request scores in a second pass.
+    """
+
+    def __init__(self, file_path, chunk_size=100_000, date_column="date",
+                 score_sentiment=True, n_workers=None, cache_path=None,
+                 backend="textblob"):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.date_column = date_column
+        self.score_sentiment = score_sentiment
+        self.engine_options = dict(
+            n_workers=n_workers, cache_path=cache_path, backend=backend
+        )
+
+        # Shared across chunks so repeated timestamp strings are parsed once
+        self.normalizer = DateNormalizer()
+
+        self.rows = 0
+        self.chunks = 0
+        self.sentiment_sum = pd.Series(dtype="float64")
+        self.sentiment_count = pd.Series(dtype="int64")
+        self.publisher_count = pd.Series(dtype="int64")
+        self.monthly_count = pd.Series(dtype="int64")
+        self._counted = False
+        self._scored = False
+
+    def _add(self, total, part):
+        return total.add(part, fill_value=0)
+
+    def run(self, sentiment=None):
+        """Stream the file once, filling the aggregates still missing.
+
+        Counts are filled on the first pass; headlines are scored when
+        ``sentiment`` is true (default ``score_sentiment``).
+        """
+        if sentiment is None:
+            sentiment = self.score_sentiment
+        count, score = not self._counted, sentiment and not self._scored
+        if not (count or score):
+            return self
+
+        engine = None
+        if score:
+            engine = SentimentEngine(**self.engine_options)
+
+        for chunk in pd.read_csv(self.file_path, chunksize=self.chunk_size):
+            # Days and months in the offset each headline was published with
+            dates = self.normalizer.local(chunk[self.date_column])
+            days = dates.dt.date
+
+            if engine is not None:
+                scores = pd.Series(engine.score(chunk["headline"]), index=chunk.index)
+                daily = scores.groupby(days)
+                self.sentiment_sum = self._add(self.sentiment_sum, daily.sum())
+                self.sentiment_count = self._add(self.sentiment_count, daily.count())
+
+            if count:
+                self.publisher_count = self._add(
+                    self.publisher_count, chunk["publisher"].value_counts()
+                )
+                months = dates.dt.to_period("M")
+                self.monthly_count = self._add(self.monthly_count, months.value_counts())
+                self.rows += len(chunk)
+                self.chunks += 1
+
+        if engine is not None:
+            engine.close()
+        self._counted = True
+        self._scored = self._scored or score
+        return self
+
+    def daily_sentiment(self):
+        """Mean sentiment per day, shaped like ``CombinedAnalysis.daily_sentiment``."""
+        self.run(sentiment=True)
+        mean = (self.sentiment_sum / self.sentiment_count).sort_index()
+        return mean.rename("sentiment").rename_axis("Date").reset_index()
+
+    def publisher_counts(self):
+        """Number of articles per publisher, largest first."""
+        self.run(sentiment=False)
+        counts = self.publisher_count.astype("int64").sort_values(ascending=False)
+        return counts.rename_axis("publisher").rename("count")
+
+    def monthly_trends(self):
+        """Number of articles per year-month, in time order."""
+        self.run(sentiment=False)
+        counts = self.monthly_count.astype("int64").sort_index()
+        return counts.rename_axis("year_month").rename("count")
@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = [
+    "Date", "Open", "High", "Low", "Close", "Adj Close", "Volume", "Dividends", "Stock Splits",
+]
+DEFAULT_START = "2010-01-01"
+US_DATE = re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$")
+
+
+class YFinanceSource:
+    """Daily bars from Yahoo Finance through ``yfinance`` (blocking calls)."""
+
+    def fetch(self, ticker, start, end):
+        """Bars of ``ticker`` from ``start`` up to, not including, ``end``."""
+        import yfinance as yf
+
+        history = yf.Ticker(ticker).history(
+            start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"),
+            auto_adjust=False, actions=True,
+        )
+        if history.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        bars = history.reset_index()
+        bars["Date"] = pd.to_datetime(bars["Date"]).dt.tz_localize(None).dt.normalize()
+        return bars.reindex(columns=PRICE_COLUMNS)
+
+
+class ReplaySource:
+    """Recorded bars read from ``<directory>/<TICKER>.csv`` fixtures, for
+    offline runs and tests. Tickers without a fixture return no bars."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, ticker, start, end):
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        bars = pd.read_csv(path)
+        bars["Date"] = pd.to_datetime(bars["Date"], format="mixed")
+        return bars[(bars["Date"] >= start) & (bars["Date"] < end)].reset_index(drop=True)
+
+
+class RecordingSource:
+    """Wraps another source and records everything it returns as fixtures
+    that ``ReplaySource`` can play back."""
+
+    def __init__(self, source, directory):
+        self.source = source
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def fetch(self, ticker, start, end):
+        bars = self.source.fetch(ticker, start, end)
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        recorded = bars
+        if os.path.exists(path):
+            previous = pd.read_csv(path)
+            previous["Date"] = pd.to_datetime(previous["Date"], format="mixed")
+            recorded = pd.concat([previous, bars], ignore_index=True)
+        recorded = recorded.drop_duplicates("Date", keep="last").sort_values("Date")
+        recorded.to_csv(path, index=False, date_format="%Y-%m-%d")
+        return bars
+
+
+class PriceStore:
+    """The ``<TICKER>_historical_data.csv`` files read by ``EDA`` and
+    ``CombinedAnalysis``. New bars are appended in each file's own date
+    format (some bundled files use mm/dd/yyyy)."""
+
+    def __init__(self, directory=os.path.join("data", "yfinance_data")):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, ticker):
+        return os.path.join(self.directory, f"{ticker}_historical_data.csv")
+
+    def last_date(self, ticker):
+        """Last stored trading day of ``ticker``, or None without a file."""
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        dates = pd.read_csv(path, usecols=["Date"])["Date"]
+        if dates.empty:
+            return None
+        return pd.to_datetime(dates, format="mixed").max()
+
+    def _date_format(self, path):
+        dates = pd.read_csv(path, usecols=["Date"], nrows=1)["Date"]
+        if len(dates) and US_DATE.match(str(dates.iloc[0])):
+            return "%m/%d/%Y"
+        return "%Y-%m-%d"
+
+    def append(self, ticker, bars):
+        """Append bars after the stored ones and return the number written.
+
+        New bars keep only the columns of an existing file, in its order.
+        """
+        if bars.empty:
+            return 0
+        path = self.path(ticker)
+        exists = os.path.exists(path)
+        # Rows follow the existing file's header, whatever its layout
+        columns = list(pd.read_csv(path, nrows=0).columns) if exists else PRICE_COLUMNS
+        bars = bars.reindex(columns=columns).sort_values("Date")
+        date_format = self._date_format(path) if exists else "%Y-%m-%d"
+        # strftime pads with zeros; the bundled mm/dd/yyyy files do not
+        dates = pd.to_datetime(bars["Date"]).dt.strftime(date_format)
+        if date_format == "%m/%d/%Y":
+            dates = dates.str.replace(r"(^|/)0", r"\1", regex=True)
+        bars = bars.assign(Date=dates)
+        bars.to_csv(path, mode="a" if exists else "w", header=not exists, index=False)
+        return len(bars)
+
+
+class RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class PriceFetcher:
+    """Refresh many tickers concurrently, fetching only the missing dates.
+
+    For each ticker the fetcher reads the last stored day, requests the
+    bars after it from ``source`` and appends them to ``store``. At most
+    ``max_concurrency`` tickers are in flight, request starts are limited
+    to ``rate_limit`` per second, and failed requests are retried with
+    exponential backoff. Blocking source and file calls run in a thread
+    pool sized to the concurrency, so any object with a
+    ``fetch(ticker, start, end)`` method can be plugged in as the source.
+    """
+
+    def __init__(self, source=None, store=None, max_concurrency=16, rate_limit=None,
+                 retries=3, backoff=1.0):
+        self.source = source or YFinanceSource()
+        self.store = store or PriceStore()
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.backoff = backoff
+
+    async def _fetch_with_retries(self, run, limiter, ticker, start, end):
+        for attempt in range(self.retries + 1):
+            await limiter.wait()
+            try:
+                return await run(self.source.fetch, ticker, start, end)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning("Fetching %s failed (%s), retrying", ticker, e)
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def _refresh_ticker(self, run, semaphore, limiter, ticker, end, default_start):
+        record = {"ticker": ticker, "start": None, "end": end, "rows": 0,
+                  "status": "up to date", "error": None}
+        async with semaphore:
+            last = await run(self.store.last_date, ticker)
+            start = last + pd.Timedelta(days=1) if last is not None else pd.Timestamp(default_start)
+            record["start"] = start
+            if start >= end:
+                return record
+            try:
+                bars = await self._fetch_with_retries(run, limiter, ticker, start, end)
+            except Exception as e:
+                logger.error("Fetching %s failed: %s", ticker, e)
+                record.update(status="failed", error=str(e))
+                return record
+
+            bars = bars.assign(Date=pd.to_datetime(bars["Date"], format="mixed"))
+            if last is not None:
+                bars = bars[bars["Date"] > last]
+            record["rows"] = await run(self.store.append, ticker, bars)
+            record["status"] = "updated" if record["rows"] else "no new bars"
+            return record
+
+    async def refresh_async(self, tickers, end=None, default_start=DEFAULT_START):
+        """Coroutine form of :meth:`refresh`."""
+        end = pd.Timestamp(end).normalize() if end is not None else pd.Timestamp.now().normalize()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = RateLimiter(self.rate_limit)
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            def run(function, *args):
+                return loop.run_in_executor(executor, function, *args)
+
+            records = await asyncio.gather(*[
+                self._refresh_ticker(run, semaphore, limiter, ticker, end, default_start)
+                for ticker in tickers
+            ])
+        return pd.DataFrame(records)
+
+    def refresh(self, tickers, end=None, default_start=DEFAULT_START):
+        """Bring the stored files of ``tickers`` up to ``end`` (exclusive, default today).
+
+        Tickers without a file are fetched from ``default_start``. Returns
+        one row per ticker with the requested range, rows written and status.
+        """
+        return asyncio.run(self.refresh_async(tickers, end, default_start))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the stored daily price files.")
+    parser.add_argument("tickers", nargs="*", help="Tickers to refresh (default: every stored file)")
+    parser.add_argument("--data-dir", default=os.path.join("data", "yfinance_data"))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=None, help="Max requests per second")
+    parser.add_argument("--replay", default=None, help="Read bars from recorded fixtures")
+    parser.add_argument("--record", default=None, help="Record fetched bars as fixtures")
+    parser.add_argument("--end", default=None)
+    args = parser.parse_args()
+
+    store = PriceStore(args.data_dir)
+    tickers = args.tickers or sorted(
+        name.split("_")[0] for name in os.listdir(args.data_dir)
+        if name.endswith("_historical_data.csv")
+    )
+    source = ReplaySource(args.replay) if args.replay else YFinanceSource()
+    if args.record:
+        source = RecordingSource(source, args.record)
+
+    fetcher = PriceFetcher(source, store, max_concurrency=args.concurrency, rate_limit=args.rate)
+    print(fetcher.refresh(tickers, end=args.end).to_string(index=False))
@@ -0,0 +1,160 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer, local_time
+
+DIMENSIONS = ("publisher", "stock")
+MEASURES = ("count", "sentiment_sum", "sentiment_count")
+
+
+def _as_list(values):
+    return [values] if isinstance(values, str) else list(values)
+
+
+class PublicationCube:
+    """Article counts and sentiment sums by (hour, publisher, stock).
+
+    Built in one pass over the news rows; monthly, daily and hourly trends
+    and publisher/stock slices are then answered from the cube alone. The
+    hour bucket also carries the day; both are taken in the UTC offset each
+    headline was published with, like the rest of the analysis. The cube can
+    be saved to Parquet and loaded on the next run instead of scanning the
+    raw rows again; its ``fingerprint`` (a hash of the date, offset,
+    publisher and stock of every row) tells whether it fits a given frame.
+    """
+
+    def __init__(self, table, rows, fingerprint=None):
+        self.table = table
+        self.rows = rows  # number of news rows aggregated
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def _row_hashes(news_df, date_column="date"):
+        # Values are hashed the same whether stored as object, Arrow or categorical
+        keys = pd.DataFrame({
+            "date": news_df[date_column].dt.as_unit("ns").array.asi8,
+            "offset": np.broadcast_to(
+                np.asarray(news_df.get(OFFSET_COLUMN, 0), dtype=np.int64), len(news_df)
+            ),
+        })
+        for dimension in DIMENSIONS:
+            if dimension in news_df.columns:
+                keys[dimension] = news_df[dimension].to_numpy()
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+    @classmethod
+    def fingerprint_of(cls, news_df, date_column="date"):
+        """Fingerprint of the rows a cube built from ``news_df`` would hold."""
+        return hashlib.sha1(cls._row_hashes(news_df, date_column).tobytes()).hexdigest()
+
+    @staticmethod
+    def _aggregate(news_df, date_column="date", sentiment_column="sentiment_score"):
+        published = local_time(news_df[date_column], news_df.get(OFFSET_COLUMN, 0))
+        frame = pd.DataFrame({"hour": published.dt.floor("h")})
+        for dimension in DIMENSIONS:
+            if dimension in news_df.columns:
+                frame[dimension] = news_df[dimension]
+        frame["count"] = 1
+        if sentiment_column in news_df.columns:
+            sentiment = news_df[sentiment_column].astype(np.float64)
+            frame["sentiment_sum"] = sentiment.fillna(0.0)
+            frame["sentiment_count"] = sentiment.notna().astype(np.int64)
+        keys = [column for column in frame.columns if column not in MEASURES]
+        return frame.groupby(keys, observed=True, dropna=False).sum().reset_index()
+
+    @classmethod
+    def build(cls, news_df, date_column="date", sentiment_column="sentiment_score"):
+        """Aggregate a news frame whose ``date_column`` is already parsed."""
+        table = cls._aggregate(news_df, date_column, sentiment_column)
+        return cls(cls._compact(table), len(news_df), cls.fingerprint_of(news_df, date_column))
+
+    @classmethod
+    def from_csv(cls, file_path, chunk_size=500_000, date_column="date"):
+        """Aggregate a news CSV chunk by chunk, without loading it whole."""
+        normalizer = DateNormalizer()
+        parts, rows, digest = [], 0, hashlib.sha1()
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            chunk[date_column] = normalizer.normalize(chunk[date_column])
+            chunk[OFFSET_COLUMN] = normalizer.last_offsets
+            parts.append(cls._aggregate(chunk, date_column))
+            digest.update(cls._row_hashes(chunk, date_column).tobytes())
+            rows += len(chunk)
+        table = pd.concat(parts, ignore_index=True)
+        keys = [column for column in table.columns if column not in MEASURES]
+        table = table.groupby(keys, observed=True, dropna=False).sum().reset_index()
+        return cls(cls._compact(table), rows, digest.hexdigest())
+
+    @staticmethod
+    def _compact(table):
+        for dimension in DIMENSIONS:
+            if dimension in table.columns:
+                table[dimension] = table[dimension].astype("category")
+        return table
+
+    @property
+    def has_sentiment(self):
+        return "sentiment_sum" in self.table.columns
+
+    def save(self, path):
+        """Write the cube to a Parquet file."""
+        table = self.table.copy()
+        table.attrs["rows"] = self.rows
+        table.attrs["fingerprint"] = self.fingerprint
+        table.to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path):
+        """Read a cube written by :meth:`save`."""
+        table = pd.read_parquet(path)
+        return cls(cls._compact(table), table.attrs.get("rows"), table.attrs.get("fingerprint"))
+
+    def slice(self, publisher=None, stock=None):
+        """Cube rows for the given publisher(s) and/or stock(s)."""
+        table = self.table
+        mask = np.ones(len(table), dtype=bool)
+        if publisher is not None:
+            mask &= table["publisher"].isin(_as_list(publisher)).to_numpy()
+        if stock is not None:
+            mask &= table["stock"].isin(_as_list(stock)).to_numpy()
+        return table[mask]
+
+    def _buckets(self, table, freq):
+        if freq == "M":
+            return table["hour"].dt.to_period("M").rename("year_month")
+        return table["hour"].dt.floor(freq).rename("date")
+
+    def counts(self, freq="D", publisher=None, stock=None):
+        """Articles per month (``"M"``), day (``"D"``) or hour (``"h"``).
+
+        Monthly counts list the months with articles, like ``value_counts``;
+        daily and hourly counts cover every bucket from the first to the
+        last article, with zeros, like ``resample(...).size()``.
+        """
+        table = self.slice(publisher, stock)
+        counts = table["count"].groupby(self._buckets(table, freq)).sum()
+        if freq == "M":
+            return counts.rename("count")
+        if counts.empty:
+            return counts.rename(None)
+        buckets = pd.date_range(counts.index.min(), counts.index.max(), freq=freq, name="date")
+        return counts.reindex(buckets, fill_value=0).rename(None)
+
+    def monthly(self, publisher=None, stock=None):
+        return self.counts("M", publisher, stock)
+
+    def daily(self, publisher=None, stock=None):
+        return self.counts("D", publisher, stock)
+
+    def hourly(self, publisher=None, stock=None):
+        return self.counts("h", publisher, stock)
+
+    def sentiment(self, freq="D", publisher=None, stock=None):
+        """Mean headline polarity per month, day or hour (buckets with scores only)."""
+        if not self.has_sentiment:
+            raise ValueError("The cube was built without sentiment scores.")
+        table = self.slice(publisher, stock)
+        sums = table[["sentiment_sum", "sentiment_count"]].groupby(self._buckets(table, freq)).sum()
+        sums = sums[sums["sentiment_count"] > 0]
+        return (sums["sentiment_sum"] / sums["sentiment_count"]).rename("sentiment")
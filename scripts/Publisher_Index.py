@@ -0,0 +1,126 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+EMAIL_DOMAIN = re.compile(r"@([\w.-]+)")
+
+
+def email_domain(publisher):
+    """Domain of an email-address publisher, or None for any other name."""
+    match = EMAIL_DOMAIN.search(publisher) if isinstance(publisher, str) else None
+    return match.group(1) if match else None
+
+
+def publisher_domain(publisher):
+    """Domain used to group publishers: the email domain, else the name itself."""
+    return email_domain(publisher) or publisher
+
+
+def _first_appearance_codes(values):
+    """Codes numbered in order of first appearance (-1 for missing) and the labels."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        category_codes = values.cat.codes.to_numpy()
+        seen = pd.unique(category_codes[category_codes >= 0])
+        remap = np.full(len(values.cat.categories) + 1, -1, dtype=np.int64)
+        remap[seen] = np.arange(len(seen))
+        # Missing values (-1) pick the trailing -1 of the remap table
+        return remap[category_codes], pd.Index(np.asarray(values.cat.categories)[seen])
+    codes, labels = pd.factorize(values)
+    return codes.astype(np.int64), pd.Index(labels)
+
+
+def _sorted_counts(counts, labels, name):
+    """Counts largest first, ties in first-appearance order (like value_counts)."""
+    series = pd.Series(counts, index=labels.rename(name), name="count")
+    return series[series > 0].sort_values(ascending=False, kind="stable")
+
+
+class PublisherIndex:
+    """Per-publisher codes, counts, row positions and domains, built once.
+
+    Domains are extracted from the distinct publisher names only and mapped
+    back to rows through the publisher codes. Counts keep the order of
+    ``value_counts`` on the original column (largest first, ties by first
+    appearance), so the queries answer exactly what the per-row pandas
+    calls did, without touching the rows again.
+    """
+
+    def __init__(self, publishers):
+        self.rows = len(publishers)
+        self.codes, self.publishers = _first_appearance_codes(publishers)
+        valid = self.codes >= 0
+        self.counts = np.bincount(self.codes[valid], minlength=len(self.publishers))
+
+        # Row positions grouped by publisher: positions of publisher i are
+        # _order[_offsets[i]:_offsets[i + 1]]
+        self._order = np.argsort(self.codes, kind="stable")[np.count_nonzero(~valid):]
+        self._offsets = np.concatenate([[0], np.cumsum(self.counts)])
+        self._lookup = {name: code for code, name in enumerate(self.publishers)}
+
+        # One domain per distinct publisher
+        self.email = np.array([email_domain(p) is not None for p in self.publishers], dtype=bool)
+        domain_codes, self.domains = pd.factorize(
+            pd.Index(self.publishers).map(publisher_domain)
+        )
+        self.domain_codes = domain_codes.astype(np.int64)
+
+        self._publisher_counts = _sorted_counts(self.counts, self.publishers, "publisher")
+        self._domain_counts = {}
+
+    def publisher_counts(self):
+        """Number of articles per publisher, largest first."""
+        return self._publisher_counts.copy()
+
+    def top_publishers(self, top_n=10):
+        return self._publisher_counts.head(top_n).copy()
+
+    def positions(self, publisher):
+        """Row positions of one publisher's articles."""
+        code = self._lookup.get(publisher)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self._order[self._offsets[code]:self._offsets[code + 1]]
+
+    def row_domains(self):
+        """Domain of every row, as a categorical."""
+        codes = np.where(self.codes >= 0, self.domain_codes[self.codes], -1)
+        return pd.Categorical.from_codes(codes, categories=self.domains)
+
+    def domain_counts(self, email_only=False):
+        """Number of articles per domain, largest first.
+
+        With ``email_only`` only publishers given as email addresses count.
+        """
+        if email_only not in self._domain_counts:
+            weights = self.counts * self.email if email_only else self.counts
+            counts = np.bincount(self.domain_codes, weights=weights, minlength=len(self.domains))
+            # Tie order follows the first row of each domain, as for value_counts
+            first_row = np.full(len(self.domains), self.rows, dtype=np.int64)
+            starts = self._order[self._offsets[:-1][self.counts > 0]]
+            np.minimum.at(first_row, self.domain_codes[self.counts > 0], starts)
+            order = np.argsort(first_row, kind="stable")
+            self._domain_counts[email_only] = _sorted_counts(
+                counts[order].astype(np.int64), pd.Index(self.domains[order]), "domain"
+            )
+        return self._domain_counts[email_only].copy()
+
+    def label_counts(self, labels):
+        """Articles per publisher and label (e.g. sentiment) as a table.
+
+        Same shape as ``groupby(["publisher", label]).size().unstack(fill_value=0)``
+        with labels sorted; rows with a missing label are left out.
+        """
+        label_codes, label_names = pd.factorize(labels, sort=True)
+        valid = (self.codes >= 0) & (label_codes >= 0)
+        table = np.bincount(
+            self.codes[valid] * len(label_names) + label_codes[valid],
+            minlength=len(self.publishers) * len(label_names),
+        ).reshape(len(self.publishers), len(label_names))
+        name = getattr(labels, "name", None)
+        frame = pd.DataFrame(
+            table,
+            index=self.publishers.rename("publisher"),
+            columns=pd.Index(np.asarray(label_names), name=name),
+        )
+        return frame[table.sum(axis=1) > 0].sort_index()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+
+def _window_sums(values, window):
+    """Sum of ``values`` over each trailing window, from cumulative sums."""
+    cumulative = np.concatenate([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+    sums = np.full(values.shape, np.nan)
+    sums[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+def rolling_lagged_correlation(dates, sentiment, returns, windows=(30, 90, 250),
+                               lags=(0, 1, 2, 3, 4, 5), min_periods=None):
+    """Rolling Pearson correlation of sentiment at t with returns at t+lag.
+
+    ``sentiment`` and ``returns`` are aligned arrays over trading days (NaN
+    where missing) and lags are counted in rows. Every (window, lag) pair
+    costs O(n): the six pair statistics are cumulated once per lag and each
+    window is a difference of two cumulative sums. A window needs at least
+    ``min_periods`` valid pairs (default: half the window, at least 2).
+
+    Returns a tidy frame with Date, window, lag, correlation and observations.
+    """
+    dates = np.asarray(dates)
+    x = np.asarray(sentiment, dtype=np.float64)
+    y_all = np.asarray(returns, dtype=np.float64)
+    n = len(x)
+
+    frames = []
+    for lag in lags:
+        # Returns lag rows after the sentiment observation
+        y = np.full(n, np.nan)
+        if lag < n:
+            y[:n - lag] = y_all[lag:]
+
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        if not valid.any():
+            continue
+        # Centering keeps the cumulative sums well conditioned
+        xc = np.where(valid, x - x[valid].mean(), 0.0)
+        yc = np.where(valid, y - y[valid].mean(), 0.0)
+        stats = np.column_stack([valid, xc, yc, xc * yc, xc * xc, yc * yc])
+
+        for window in windows:
+            if window > n:
+                continue
+            count, sx, sy, sxy, sxx, syy = _window_sums(stats, window).T
+            required = min_periods if min_periods is not None else max(2, window // 2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                covariance = count * sxy - sx * sy
+                variance = (count * sxx - sx * sx) * (count * syy - sy * sy)
+                correlation = np.clip(covariance / np.sqrt(variance), -1.0, 1.0)
+            correlation[(count < required) | ~(variance > 0)] = np.nan
+
+            frames.append(pd.DataFrame({
+                "Date": dates,
+                "window": window,
+                "lag": lag,
+                "correlation": correlation,
+                "observations": np.nan_to_num(count).astype(np.int64),
+            }).iloc[window - 1:])
+
+    if not frames:
+        return pd.DataFrame(columns=["Date", "window", "lag", "correlation", "observations"])
+    return pd.concat(frames, ignore_index=True)
@@ -1,45 +1,167 @@
+import os
+
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-from textblob import TextBlob  # type: ignore
-import re
+
+from scripts.Analysis_Graph import AnalysisGraph
+from scripts.Chart_Output import ChartOutput
+from scripts.Columnar_Store import is_dataset, load_news
+from scripts.Compact_Frame import (
+    compact_news_frame, memory_report, read_news_csv, value_counts
+)
+from scripts.Date_Normalizer import OFFSET_COLUMN, DateNormalizer, local_time
+from scripts.News_Stream import NewsStream
+from scripts.Publication_Cube import PublicationCube
+from scripts.Publisher_Index import PublisherIndex, email_domain
+from scripts.Sentiment_Engine import SentimentEngine
+from scripts.Topic_Model import HeadlineTopicModel, topic_daily_sentiment
 
 
 class NewsAnalysis:
-    def __init__(self, file_path):
-        try:
-            self.df = pd.read_csv(file_path)  # Use read_csv for CSV files
+    def __init__(self, file_path, chunk_size=None, tickers=None, start=None, end=None,
+                 output_dir=None, formats=("png",), compact=True, cube_path=None,
+                 n_workers=None, cache_path=None, backend="textblob"):
+        # With an output_dir charts are written to files instead of shown
+        self.charts = ChartOutput(output_dir, formats=formats, prefix="news")
 
-            # First attempt to parse dates with the first format
-            self.df["date"] = pd.to_datetime(
-                self.df["date"], format="%Y-%m-%d %H:%M:%S%z", errors="coerce"
+        # In streaming mode the file is read chunk by chunk into running
+        # aggregates (see NewsStream) and no full DataFrame is kept; headlines
+        # are only scored when daily_sentiment is asked for
+        self.df = None
+        self.stream = None
+        self.compact = compact
+        # Counts by (hour, publisher, stock); loaded from cube_path when it exists
+        self.cube_path = cube_path
+        self._cube = None
+        self._cube_frame = None
+        # Scores, daily sentiment and topics are cached graph nodes over the
+        # frame; the engine settings also apply to the stream
+        self.engine_options = {"n_workers": n_workers, "chunk_size": 5000, "cache_path": cache_path}
+        self.graph = self._build_graph()
+        self.graph.set("backend", backend)
+        if chunk_size is not None and not is_dataset(file_path):
+            self.stream = NewsStream(
+                file_path, chunk_size=chunk_size, date_column="date",
+                n_workers=n_workers, cache_path=cache_path, backend=backend,
             )
+            return
 
-            # For rows where the date parsing failed, try the second format
-            self.df["date"] = self.df["date"].fillna(
-                pd.to_datetime(
-                    self.df["date"], format="%m/%d/%Y %H:%M", errors="coerce"
-                )
-            )
+        try:
+            if is_dataset(file_path):
+                # Columnar dataset: dates are already parsed and filters are
+                # pushed down to the Parquet scan
+                self.df = load_news(file_path, tickers=tickers, start=start, end=end)
+            else:
+                self.df = read_news_csv(file_path, compact)  # Use read_csv for CSV files
+
+            # Parse every date format in one pass into UTC timestamps, keeping
+            # each row's original offset so days are taken as published
+            normalizer = DateNormalizer()
+            self.df["date"] = normalizer.normalize(self.df["date"], self.df.get(OFFSET_COLUMN))
+            self.df[OFFSET_COLUMN] = normalizer.last_offsets
+            self.date_stats = normalizer.last_stats
+            self._compact()
 
         except Exception as e:
             print(f"Error reading the file: {e}")
 
+    def _frame(self):
+        """The full news frame, or a clear error when none is loaded."""
+        if self.df is None:
+            if self.stream is not None:
+                reason = "in streaming mode (chunk_size)"
+            else:
+                reason = "because the file could not be read"
+            raise ValueError(f"This analysis needs the full news frame, which is not loaded {reason}.")
+        return self.df
+
+    def _compact(self):
+        # Categoricals, Arrow strings and float32 scores (see Compact_Frame)
+        if self.compact and self.df is not None:
+            compact_news_frame(self.df)
+
+    def _build_graph(self):
+        graph = AnalysisGraph()
+        graph.input("news")
+        graph.input("backend", "textblob")
+        graph.input("topic_params", {})
+        graph.node("publisher_index", lambda df: PublisherIndex(df["publisher"]), ["news"])
+        graph.node("sentiment", self._sentiment, ["news", "backend"])
+        graph.node("daily_sentiment", self._daily_sentiment, ["news", "sentiment"])
+        graph.node("topics", self._topics, ["news", "topic_params"])
+        graph.node("topic_sentiment", self._topic_sentiment, ["news", "topics", "sentiment"])
+        return graph
+
+    def result(self, name):
+        """A cached analysis result (``"publisher_index"``, ``"sentiment"``,
+        ``"daily_sentiment"``, ``"topics"`` or ``"topic_sentiment"``),
+        computing only what is missing."""
+        # A frame assigned to self.df replaces the graph input and its results
+        self.graph.set("news", self._frame())
+        return self.graph.get(name)
+
+    def publication_days(self, df=None):
+        """Day of each headline in the UTC offset it was published with."""
+        df = self.df if df is None else df
+        return local_time(df["date"], df.get(OFFSET_COLUMN, 0)).dt.date
+
+    def publisher_index(self):
+        """Publisher codes, counts, positions and domains, built once per frame."""
+        index = self.result("publisher_index")
+        if index.rows != len(self.df):
+            # Rows were added or dropped in place: every result is stale
+            self.graph.invalidate("news")
+            index = self.result("publisher_index")
+        return index
+
+    def publication_cube(self):
+        """Counts and sentiment sums by (hour, publisher, stock), built once.
+
+        With a ``cube_path`` a saved cube is reused when its fingerprint
+        matches the rows of this frame, and a newly built one is saved there.
+        """
+        self._frame()
+        cube = self._cube
+        if cube is not None and (self._cube_frame is not self.df or cube.rows != len(self.df)):
+            cube = None
+        if cube is None and self.cube_path and os.path.exists(self.cube_path):
+            saved = PublicationCube.load(self.cube_path)
+            if saved.fingerprint == PublicationCube.fingerprint_of(self.df, date_column="date"):
+                cube = saved
+        has_scores = "sentiment_score" in self.df.columns
+        if cube is None or (has_scores and not cube.has_sentiment):
+            cube = PublicationCube.build(self.df, date_column="date")
+            if self.cube_path:
+                cube.save(self.cube_path)
+        self._cube, self._cube_frame = cube, self.df
+        return cube
+
+    def memory_report(self):
+        """Memory used by each column of the news frame, in megabytes."""
+        return memory_report({"news": self.df})
+
     def calculate_headline_length(self):
+        self._frame()
         self.df["headline_length"] = self.df["headline"].apply(len)
-        plt.figure(figsize=(10, 6))
-        plt.hist(self.df["headline_length"], bins=30, edgecolor='black')
-        plt.title('Distribution of Headline Lengths')
-        plt.xlabel('Headline Length')
-        plt.ylabel('Frequency')
-        plt.grid(True)
-        plt.show()
+        fig = self.charts.figure(figsize=(10, 6))
+        ax = fig.subplots()
+        ax.hist(self.df["headline_length"], bins=30, edgecolor='black')
+        ax.set_title('Distribution of Headline Lengths')
+        ax.set_xlabel('Headline Length')
+        ax.set_ylabel('Frequency')
+        ax.grid(True)
+        return self.charts.finish(fig, "headline_length")
 
     def articles_per_publisher(self):
-        return self.df["publisher"].value_counts()
+        if self.stream is not None:
+            return self.stream.publisher_counts()
+        return self.publisher_index().publisher_counts()
 
     def publication_trends(self):
-        self.df["year_month"] = self.df["date"].dt.to_period("M")
-        return self.df["year_month"].value_counts().sort_index()
+        if self.stream is not None:
+            return self.stream.monthly_trends()
+        return self.publication_cube().monthly()
 
     # def sentiment_analysis(self):
     #     self.df["sentiment"] = self.df["headline"].apply(
@@ -47,52 +169,68 @@ class NewsAnalysis:
     #     )
 
     def publication_frequency(self):
-        self.df.set_index("date", inplace=True)
-        return self.df.resample("D").size()
+        return self.publication_cube().daily()
+
+    def hourly_frequency(self):
+        """Articles per hour as published (own UTC offset), with zeros for empty hours."""
+        return self.publication_cube().hourly()
 
     def top_publishers(self):
-        return self.df["publisher"].value_counts().head(10)
+        if self.stream is not None:
+            return self.articles_per_publisher().head(10)
+        return self.publisher_index().top_publishers(10)
+
+    def daily_sentiment(self):
+        """Mean headline polarity per day."""
+        if self.stream is not None:
+            return self.stream.daily_sentiment()
+        return self.result("daily_sentiment")
+
+    def _daily_sentiment(self, df, polarity):
+        days = self.publication_days(df).rename("Date")
+        # float64 scores from the graph, not the float32 column of the frame
+        daily = pd.Series(polarity, index=df.index).groupby(days).mean()
+        return daily.rename("sentiment").reset_index()
 
     def domain_counts(self):
-        self.df["domain"] = self.df["publisher"].apply(
-            lambda x: x.split("@")[-1] if "@" in x else x
-        )
-        return self.df["domain"].value_counts()
+        """Articles per domain: the email domain of a publisher, else its name."""
+        index = self.publisher_index()
+        self.df["domain"] = index.row_domains()
+        self._compact()
+        return index.domain_counts()
 
     def save_results(self, output_path):
-        self.df.to_excel(output_path, index=False)
+        self._frame().to_excel(output_path, index=False)
 
     def plot_top_publishers(self, top_n=20):
         """Plot the top N publishers by the number of articles."""
         top_publishers = self.articles_per_publisher().head(top_n)
+        fig = self.charts.figure(figsize=(12, 6))
+        ax = fig.subplots()
         top_publishers.plot(
             kind="bar",
-            figsize=(12, 6),
+            ax=ax,
             title=f"Top {top_n} Publishers by Number of Articles",
         )
-        plt.xlabel("Publisher")
-        plt.ylabel("Number of Articles")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.show()
+        ax.set_xlabel("Publisher")
+        ax.set_ylabel("Number of Articles")
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
+        return self.charts.finish(fig, "top_publishers")
 
     def plot_publication_trends(self):
         """Plot the publication trends over time."""
-        # Ensure 'year_month' column is created if not already present
-        if "year_month" not in self.df.columns:
-            self.df["year_month"] = self.df["date"].dt.to_period("M")
-        
         # Compute publication trends
-        publication_trends = self.df["year_month"].value_counts().sort_index()
+        publication_trends = self.publication_trends()
         
         # Plotting the trends
-        publication_trends.plot(
-            kind="line", figsize=(12, 6), title="Publication Trends Over Time"
-        )
-        plt.xlabel("Year-Month")
-        plt.ylabel("Number of Articles")
-        plt.tight_layout()
-        plt.show()
+        fig = self.charts.figure(figsize=(12, 6))
+        ax = fig.subplots()
+        publication_trends.plot(kind="line", ax=ax, title="Publication Trends Over Time")
+        ax.set_xlabel("Year-Month")
+        ax.set_ylabel("Number of Articles")
+        fig.tight_layout()
+        return self.charts.finish(fig, "publication_trends")
 
     def display_top_publishers(self, top_n=20):
         """Display the top N publishers in tabular format."""
@@ -102,87 +240,139 @@ class NewsAnalysis:
 
     def display_publication_trends(self, top_n=10):
         """Display the first N publication trends in tabular format."""
-        # Ensure 'year_month' column is created if not already present
-        if "year_month" not in self.df.columns:
-            self.df["year_month"] = self.df["date"].dt.to_period("M")
-        
         # Compute publication trends
-        publication_trends = self.df["year_month"].value_counts().sort_index().head(top_n)
+        publication_trends = self.publication_trends().head(top_n)
         
         # Displaying the trends
         print(f"First {top_n} Publication Trends in Tabular Format:")
         print(publication_trends)
 
     # Text Analysis(Sentiment analysis & Topic Modeling):
-    def sentiment_analysis(self):
-        def get_sentiment(headline):
-            analysis = TextBlob(headline)
-            if analysis.sentiment.polarity > 0:
-                return "Positive"
-            elif analysis.sentiment.polarity == 0:
-                return "Neutral"
-            else:
-                return "Negative"
-
-        self.df["sentiment"] = self.df["headline"].apply(get_sentiment)
+    def sentiment_analysis(self, n_workers=None, chunk_size=None, cache_path=None,
+                           backend=None):
+        # Settings not given keep the constructor's; headlines are scored
+        # once per frame and backend (see _sentiment)
+        options = {"n_workers": n_workers, "chunk_size": chunk_size, "cache_path": cache_path}
+        self.engine_options.update(
+            {name: value for name, value in options.items() if value is not None}
+        )
+        if backend is not None:
+            self.graph.set("backend", backend)
+        self.result("sentiment")
         
         # Visualize the sentiment data
-        sentiment_counts = self.df["sentiment"].value_counts()
-        sentiment_counts.plot(kind='bar', color=['green', 'blue', 'red'])
-        plt.xlabel('Sentiment')
-        plt.ylabel('Number of Headlines')
-        plt.title('Sentiment Analysis of Headlines')
-        plt.show()
+        self.plot_sentiment_distribution()
     
         return self.df[["headline", "sentiment"]]
+
+    def plot_sentiment_distribution(self):
+        """Plot the number of Positive, Neutral and Negative headlines."""
+        # Ensure the headlines are scored (cached after the first call)
+        self.result("sentiment")
+
+        sentiment_counts = value_counts(self.df["sentiment"])
+        fig = self.charts.figure()
+        ax = fig.subplots()
+        sentiment_counts.plot(kind='bar', ax=ax, color=['green', 'blue', 'red'])
+        ax.set_xlabel('Sentiment')
+        ax.set_ylabel('Number of Headlines')
+        ax.set_title('Sentiment Analysis of Headlines')
+        return self.charts.finish(fig, "sentiment")
+
+    def _sentiment(self, df, backend):
+        # Score all headlines in chunks across a process pool, reusing cached scores
+        engine = SentimentEngine(backend=backend, **self.engine_options)
+        polarity = engine.score(df["headline"])
+        self.sentiment_cache_stats = engine.last_cache_stats
+        engine.close()
+        df["sentiment_score"] = polarity
+        df["sentiment"] = np.select(
+            [polarity > 0, polarity == 0], ["Positive", "Neutral"], default="Negative"
+        )
+        self._compact()
+        return polarity
     
+    def topic_modeling(self, n_topics=10, batch_size=50_000, n_jobs=None, passes=1,
+                       n_terms=10):
+        """Fit an online LDA topic model on the headlines and label each row.
+
+        Headlines are hashed into sparse term counts batch by batch (see
+        HeadlineTopicModel), so memory stays bounded by ``batch_size``.
+        Sets a ``topic`` column and returns the top terms of every topic.
+        """
+        self.graph.set("topic_params", {
+            "n_topics": n_topics, "batch_size": batch_size, "n_jobs": n_jobs, "passes": passes,
+        })
+        return self.result("topics").top_terms(n_terms)
+
+    def _topics(self, df, params):
+        self.topic_model = HeadlineTopicModel(**params)
+        self.topic_model.fit(df["headline"])
+        df["topic"] = self.topic_model.transform(df["headline"])
+        return self.topic_model
+
+    def topic_sentiment(self):
+        """Mean headline polarity and article count per day and topic.
+
+        Shaped like ``daily_sentiment`` plus a ``topic`` column, so one
+        topic's rows can be correlated with returns like the overall series.
+        """
+        return self.result("topic_sentiment")
+
+    def _topic_sentiment(self, df, topic_model, polarity):
+        return topic_daily_sentiment(self.publication_days(df), df["topic"], polarity)
+
     def extract_domain(self, email):
         """Extract domain from email address."""
-        match = re.search(r'@([\w.]+)', email)
-        return match.group(1) if match else None
+        return email_domain(email)
     
     def analyze_publisher_domains(self):
-        """Identify unique domains and their frequencies."""
-        # Extract domains
-        self.df['domain'] = self.df['publisher'].apply(self.extract_domain)
+        """Identify unique domains of email-address publishers and their frequencies."""
+        # Domains are extracted once per distinct publisher (see PublisherIndex)
+        index = self.publisher_index()
+        self.df['domain'] = index.row_domains()
+        self._compact()
         
         # Count frequencies of each domain
-        domain_counts = self.df['domain'].value_counts()
+        domain_counts = index.domain_counts(email_only=True)
         
         return domain_counts
     
     def display_domain_distribution(self):
         """Plot the distribution of domains."""
         domain_counts = self.analyze_publisher_domains()
-        plt.figure(figsize=(12, 6))
-        domain_counts.plot(kind='bar')
-        plt.xlabel('Domain')
-        plt.ylabel('Frequency')
-        plt.title('Frequency of Publishers by Domain')
-        plt.xticks(rotation=45)
-        plt.show()
+        fig = self.charts.figure(figsize=(12, 6))
+        ax = fig.subplots()
+        domain_counts.plot(kind='bar', ax=ax)
+        ax.set_xlabel('Domain')
+        ax.set_ylabel('Frequency')
+        ax.set_title('Frequency of Publishers by Domain')
+        plt.setp(ax.get_xticklabels(), rotation=45)
+        return self.charts.finish(fig, "domain_distribution")
         
     def plot_sentiment_per_publisher(self, top_n=20):
         """Plot the number of Positive, Negative, and Neutral news per publisher."""
         
-        # Ensure sentiment analysis is already done
-        if 'sentiment' not in self.df.columns:
-            self.sentiment_analysis()
+        # Ensure the headlines are scored (cached after the first call)
+        self.result("sentiment")
         
         # Group by publisher and sentiment, then count the number of headlines
-        sentiment_per_publisher = self.df.groupby(['publisher', 'sentiment']).size().unstack(fill_value=0)
+        index = self.publisher_index()
+        sentiment_per_publisher = index.label_counts(self.df['sentiment'])
         
         # Filter to top N publishers by total number of articles
-        top_publishers = self.df['publisher'].value_counts().head(top_n).index
+        top_publishers = index.top_publishers(top_n).index
         sentiment_per_publisher = sentiment_per_publisher.loc[top_publishers]
         
         # Plot the sentiment counts per publisher
-        sentiment_per_publisher.plot(kind='bar', stacked=True, figsize=(14, 7),
+        fig = self.charts.figure(figsize=(14, 7))
+        ax = fig.subplots()
+        sentiment_per_publisher.plot(kind='bar', stacked=True, ax=ax,
                                     title=f'Sentiment Distribution per Publisher (Top {top_n})',
                                     color=['green', 'blue', 'red'])
         
-        plt.xlabel('Publisher')
-        plt.ylabel('Number of Articles')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.show()
+        ax.set_xlabel('Publisher')
+        ax.set_ylabel('Number of Articles')
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        fig.tight_layout()
+        return self.charts.finish(fig, "sentiment_per_publisher")
@@ -0,0 +1,202 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 252
+METRICS = [
+    "total_return", "annual_return", "annual_volatility", "sharpe", "max_drawdown",
+    "turnover", "exposure", "hit_rate",
+]
+
+
+def sentiment_signal(sentiment, mode="raw", zscore_window=60, min_periods=None):
+    """Daily signal per ticker from a (dates x tickers) sentiment frame.
+
+    ``"raw"`` uses the mean polarity itself; ``"zscore"`` scales it by the
+    mean and standard deviation of the previous ``zscore_window`` days of
+    that ticker (past days only, so the signal never sees the day itself),
+    needing news on ``min_periods`` of them (default a third of the window).
+    Days without news have no signal (NaN).
+    """
+    if mode == "raw":
+        return sentiment
+    if mode == "zscore":
+        if min_periods is None:
+            min_periods = max(2, zscore_window // 3)
+        rolling = sentiment.rolling(zscore_window, min_periods=min_periods)
+        mean, std = rolling.mean().shift(1), rolling.std().shift(1)
+        return (sentiment - mean) / std.where(std > 0)
+    raise ValueError(f"Unknown signal mode: {mode}")
+
+
+class SentimentBacktest:
+    """Vectorized long/short backtest of the daily sentiment signal.
+
+    A ticker goes long after a day whose signal is above ``threshold`` and
+    short after one below ``-threshold`` (long only without
+    ``long_short``). Each signal is held for ``holding_period`` trading
+    days starting the next day, overlapping signals are averaged, and the
+    portfolio is equally weighted across tickers. ``cost`` is charged per
+    unit of turnover (0.001 is 10 bps).
+
+    The simulation is a set of array operations over a (thresholds x
+    holding periods x dates x tickers) block: positions come from one
+    cumulative sum of the entry signals per threshold, so no loop runs
+    over days. The threshold grid is processed in chunks of at most
+    ``max_elements`` block cells to bound memory.
+    """
+
+    def __init__(self, sentiment, returns, signal="raw", zscore_window=60, long_short=True,
+                 periods_per_year=PERIODS_PER_YEAR, trim=True, dtype=np.float32):
+        returns = returns.sort_index()
+        if not sentiment.index.isin(returns.index).any():
+            raise ValueError(
+                "No sentiment date matches a return date; normalize the news dates first."
+            )
+        sentiment = sentiment.reindex(index=returns.index, columns=returns.columns)
+        signal_frame = sentiment_signal(sentiment, signal, zscore_window)
+        if trim:
+            # Before the first headline no position can be open
+            has_signal = signal_frame.notna().any(axis=1).to_numpy()
+            first = has_signal.argmax() if has_signal.any() else len(has_signal)
+            returns, signal_frame = returns.iloc[first:], signal_frame.iloc[first:]
+        self.dates = returns.index
+        self.tickers = list(returns.columns)
+        self.long_short = long_short
+        self.periods_per_year = periods_per_year
+        self.dtype = dtype
+        # Missing returns (before listing, holidays) earn nothing
+        self.returns = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+        self.returns = np.nan_to_num(self.returns).astype(dtype)
+        self.signal = signal_frame.to_numpy(dtype=np.float64, na_value=np.nan).astype(dtype)
+
+    @classmethod
+    def from_analysis(cls, analysis, **kwargs):
+        """Backtest the panels of a ``MultiTickerAnalysis`` or ``CombinedAnalysis``."""
+        if hasattr(analysis, "tickers"):
+            # MultiTickerAnalysis: wide daily sentiment and returns frames;
+            # sentiment grouped before the dates were normalized is redone
+            if analysis.date_stats is None:
+                analysis.normalize_dates()
+                analysis.daily_sentiment = None
+            if analysis.daily_sentiment is None:
+                analysis.analyze_sentiment()
+            if analysis.returns is None:
+                analysis.calculate_daily_returns()
+            return cls(analysis.daily_sentiment, analysis.returns, **kwargs)
+        # CombinedAnalysis: every trading day of its stock, not only news days
+        ticker = analysis.ticker or "stock"
+        returns = analysis.graph.get("returns").set_index("Date")["Daily_Return"]
+        sentiment = analysis.graph.get("daily_sentiment").set_index("Date")["sentiment"]
+        return cls(sentiment.to_frame(ticker), returns.to_frame(ticker), **kwargs)
+
+    @classmethod
+    def from_merged(cls, merged, ticker_column="ticker", **kwargs):
+        """Backtest a long frame of Date, ticker, sentiment and Daily_Return rows."""
+        if ticker_column not in merged.columns:
+            merged = merged.assign(**{ticker_column: "stock"})
+        sentiment = merged.pivot(index="Date", columns=ticker_column, values="sentiment")
+        returns = merged.pivot(index="Date", columns=ticker_column, values="Daily_Return")
+        return cls(sentiment, returns, **kwargs)
+
+    def _entries(self, thresholds):
+        """Entry direction (+1, -1, 0) per (threshold, date, ticker)."""
+        signal = self.signal[None, :, :]
+        levels = np.asarray(thresholds, dtype=self.dtype)[:, None, None]
+        entries = (signal > levels).astype(self.dtype)
+        if self.long_short:
+            entries -= signal < -levels
+        return entries
+
+    def _positions(self, thresholds, holding_periods):
+        """Positions per (threshold, holding period, date, ticker).
+
+        The position on day t averages the entries of days t-h .. t-1, read
+        off one cumulative sum of the entries along the date axis.
+        """
+        entries = self._entries(thresholds)
+        n_dates = entries.shape[1]
+        cumulative = np.zeros(
+            (len(thresholds), n_dates + 1, len(self.tickers)), dtype=self.dtype
+        )
+        np.cumsum(entries, axis=1, out=cumulative[:, 1:])
+        holding = np.asarray(holding_periods)
+        days = np.arange(n_dates)
+        start = np.clip(days[None, :] - holding[:, None], 0, None)  # (H, T)
+        positions = cumulative[:, None, days, :] - cumulative[:, start, :]
+        positions /= holding.astype(self.dtype)[None, :, None, None]
+        return positions
+
+    def _metrics(self, daily, turnover, exposure):
+        """Summary metrics of daily portfolio returns along the last axis."""
+        n_days = daily.shape[-1]
+        mean = daily.mean(axis=-1)
+        volatility = daily.std(axis=-1) * np.sqrt(self.periods_per_year)
+        equity = np.cumprod(1 + daily.astype(np.float64), axis=-1)
+        drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+        invested = exposure > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = mean * self.periods_per_year / volatility
+            hit_rate = ((daily > 0) & invested).sum(axis=-1) / invested.sum(axis=-1)
+        return {
+            "total_return": equity[..., -1] - 1 if n_days else np.zeros(mean.shape),
+            "annual_return": mean * self.periods_per_year,
+            "annual_volatility": volatility,
+            "sharpe": np.where(volatility > 0, sharpe, np.nan),
+            "max_drawdown": drawdown.min(axis=-1) if n_days else np.zeros(mean.shape),
+            "turnover": turnover.mean(axis=-1),
+            "exposure": exposure.mean(axis=-1),
+            "hit_rate": hit_rate,
+        }
+
+    def _simulate(self, thresholds, holding_periods, costs):
+        """Daily net returns, turnover and exposure per (threshold, holding, cost)."""
+        positions = self._positions(thresholds, holding_periods)
+        n_tickers = len(self.tickers)
+        gross = np.einsum("ahtn,tn->aht", positions, self.returns) / n_tickers
+        previous = np.concatenate(
+            [np.zeros_like(positions[:, :, :1]), positions[:, :, :-1]], axis=2
+        )
+        turnover = np.abs(positions - previous).sum(axis=3) / n_tickers
+        exposure = np.abs(positions).sum(axis=3) / n_tickers
+        costs = np.asarray(costs, dtype=self.dtype)[None, None, :, None]
+        daily = gross[:, :, None, :] - costs * turnover[:, :, None, :]
+        return daily, turnover[:, :, None, :], exposure[:, :, None, :]
+
+    def run(self, thresholds=(0.0, 0.05, 0.1, 0.2), holding_periods=(1, 2, 5, 10),
+            costs=(0.0, 0.001), max_elements=20_000_000):
+        """Metrics of every (threshold, holding_period, cost) combination.
+
+        Returns one row per combination with the columns of ``METRICS``.
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        holding_periods = np.asarray(holding_periods, dtype=np.int64)
+        costs = np.asarray(costs, dtype=np.float64)
+        if (holding_periods < 1).any():
+            raise ValueError("Holding periods must be at least one day.")
+
+        # Thresholds per chunk so one position block stays under max_elements
+        block = len(holding_periods) * len(self.dates) * max(len(self.tickers), 1)
+        step = max(1, max_elements // max(block, 1))
+        frames = []
+        for start in range(0, len(thresholds), step):
+            chunk = thresholds[start:start + step]
+            daily, turnover, exposure = self._simulate(chunk, holding_periods, costs)
+            metrics = self._metrics(daily, turnover, exposure)
+            grid = np.array(list(itertools.product(chunk, holding_periods, costs)))
+            frame = pd.DataFrame({
+                "threshold": grid[:, 0],
+                "holding_period": grid[:, 1].astype(np.int64),
+                "cost": grid[:, 2],
+            })
+            for name in METRICS:
+                values = np.broadcast_to(metrics[name], daily.shape[:3])
+                frame[name] = values.reshape(-1).astype(np.float64)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+    def daily_returns(self, threshold, holding_period, cost=0.0):
+        """Daily net portfolio returns of one combination, indexed by date."""
+        daily, _, _ = self._simulate([threshold], [holding_period], [cost])
+        return pd.Series(daily[0, 0, 0].astype(np.float64), index=self.dates, name="return")
@@ -0,0 +1,108 @@
+import hashlib
+import sqlite3
+import unicodedata
+
+# SQLite limits the number of bound parameters per statement
+_BATCH_SIZE = 900
+
+
+def normalize_headline(text):
+    """Normalize a headline before hashing (unicode form and whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+class SentimentCache:
+    """On-disk polarity cache keyed by a hash of the normalized headline.
+
+    Keys combine the headline with the scorer version, so results from a
+    different backend or library version are never reused. The cache keeps
+    at most ``max_entries`` rows and evicts the least recently used ones.
+    """
+
+    def __init__(self, path, scorer_version, max_entries=5_000_000):
+        self.path = path
+        self.scorer_version = scorer_version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment ("
+            "key TEXT PRIMARY KEY, polarity REAL NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)"
+        )
+        self.conn.commit()
+
+        # Monotonic counter used as the LRU clock
+        row = self.conn.execute("SELECT MAX(last_used) FROM sentiment").fetchone()
+        self._clock = (row[0] or 0) + 1
+
+    def make_key(self, headline):
+        """Return the cache key of a headline for this scorer version."""
+        payload = f"{self.scorer_version}\x00{normalize_headline(headline)}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Look up keys in bulk and return a dict of the ones found."""
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(unique_keys), _BATCH_SIZE):
+            batch = unique_keys[start:start + _BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, polarity FROM sentiment WHERE key IN ({placeholders})",
+                batch,
+            ).fetchall()
+            found.update(rows)
+
+        # Touch the hit entries so they survive eviction
+        if found:
+            self.conn.executemany(
+                "UPDATE sentiment SET last_used = ? WHERE key = ?",
+                [(self._clock, key) for key in found],
+            )
+            self._clock += 1
+            self.conn.commit()
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items):
+        """Store (key, polarity) pairs and evict old entries over the cap."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO sentiment (key, polarity, last_used) VALUES (?, ?, ?)",
+            [(key, float(polarity), self._clock) for key, polarity in items],
+        )
+        self._clock += 1
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM sentiment WHERE key IN ("
+                "SELECT key FROM sentiment ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self):
+        self.conn.close()
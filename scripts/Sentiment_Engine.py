@@ -0,0 +1,129 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
+
+import numpy as np
+from textblob import TextBlob  # type: ignore
+
+from scripts.Lexicon_Scorer import LexiconScorer
+from scripts.Sentiment_Cache import SentimentCache
+
+BACKENDS = ("textblob", "fast")
+
+
+def _score_chunk(headlines):
+    """Score one chunk of headlines with TextBlob (runs inside a worker)."""
+    return [TextBlob(text).sentiment.polarity for text in headlines]
+
+
+class SentimentEngine:
+    """Score headlines in chunks across a process pool.
+
+    With the default ``"textblob"`` backend the polarity of every headline
+    is exactly what ``TextBlob(text).sentiment.polarity`` returns, only the
+    work is spread over ``n_workers`` processes instead of a single
+    ``Series.apply``. The ``"fast"`` backend uses the vectorized
+    :class:`LexiconScorer` in-process instead.
+    When a ``cache_path`` is given, headlines already scored by the same
+    scorer version are read from a :class:`SentimentCache` instead.
+    """
+
+    def __init__(self, n_workers=None, chunk_size=5000, cache_path=None,
+                 cache_max_entries=5_000_000, backend="textblob"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sentiment backend {backend!r}, expected one of {BACKENDS}")
+        self.backend = backend
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.lexicon_scorer = None
+        if backend == "fast":
+            self.lexicon_scorer = LexiconScorer()
+            self.scorer_version = LexiconScorer.scorer_version
+        else:
+            self.scorer_version = f"textblob-{version('textblob')}"
+        self.cache = None
+        self.last_cache_stats = None
+        if cache_path is not None:
+            self.cache = SentimentCache(
+                cache_path, self.scorer_version, max_entries=cache_max_entries
+            )
+        self.last_rows = 0
+        self.last_seconds = 0.0
+        self.last_throughput = 0.0
+
+    def _chunks(self, headlines):
+        for start in range(0, len(headlines), self.chunk_size):
+            yield headlines[start:start + self.chunk_size]
+
+    def _score_uncached(self, headlines):
+        if self.lexicon_scorer is not None:
+            return self.lexicon_scorer.score(headlines)
+
+        if self.n_workers == 1 or len(headlines) <= self.chunk_size:
+            return _score_chunk(headlines)
+
+        scores = []
+        with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+            # map keeps the chunk order, so scores line up with headlines
+            for chunk_scores in pool.map(_score_chunk, self._chunks(headlines)):
+                scores.extend(chunk_scores)
+        return scores
+
+    def _score_with_cache(self, headlines):
+        keys = [self.cache.make_key(text) for text in headlines]
+        found = self.cache.get_many(keys)
+
+        # Score each missing headline once, even if it repeats in this run
+        missing = {}
+        for key, text in zip(keys, headlines):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_scores = self._score_uncached(list(missing.values()))
+            scored = dict(zip(missing.keys(), new_scores))
+            self.cache.put_many(scored.items())
+            found.update(scored)
+
+        self.last_cache_stats = self.cache.stats()
+        return [found[key] for key in keys]
+
+    def score(self, headlines):
+        """Return a float64 NumPy array with the polarity of each headline."""
+        headlines = list(headlines)
+        start = time.perf_counter()
+
+        if self.cache is not None:
+            scores = self._score_with_cache(headlines)
+        else:
+            scores = self._score_uncached(headlines)
+
+        polarity = np.asarray(scores, dtype=np.float64)
+
+        # Keep throughput numbers of the last run for reporting
+        self.last_rows = len(headlines)
+        self.last_seconds = time.perf_counter() - start
+        self.last_throughput = (
+            self.last_rows / self.last_seconds if self.last_seconds > 0 else 0.0
+        )
+        return polarity
+
+    def throughput_report(self):
+        """Return a short text summary of the last scoring run."""
+        report = (
+            f"Scored {self.last_rows} headlines in {self.last_seconds:.2f}s "
+            f"({self.last_throughput:,.0f} rows/s, {self.backend} backend, "
+            f"{self.n_workers} workers)"
+        )
+        if self.last_cache_stats is not None:
+            report += (
+                f", cache hits {self.last_cache_stats['hits']}"
+                f" / misses {self.last_cache_stats['misses']}"
+            )
+        return report
+
+    def close(self):
+        """Close the cache connection, if any."""
+        if self.cache is not None:
+            self.cache.close()
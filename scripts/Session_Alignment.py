@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+EXCHANGE_TIMEZONE = "America/New_York"
+CLOSE_TIME = "16:00"
+SESSION_RULES = [
+    "same_session", "after_close", "non_trading_day", "before_first_session",
+    "after_last_session", "missing_timestamp",
+]
+
+
+def _nanos(naive):
+    """int64 nanoseconds of a naive datetime Series (NaT as the int64 minimum)."""
+    return naive.dt.as_unit("ns").to_numpy().view(np.int64)
+
+
+def _day_keys(days):
+    """Trading days as sorted, unique int64 nanosecond keys of naive midnights."""
+    days = pd.to_datetime(pd.Series(days), format="mixed")
+    if days.dt.tz is not None:
+        days = days.dt.tz_localize(None)
+    return np.unique(_nanos(days.dt.normalize().dropna()))
+
+
+def session_closes(trading_days, timezone=EXCHANGE_TIMEZONE, close_time=CLOSE_TIME):
+    """Close of every trading day as int64 UTC nanoseconds, sorted."""
+    days = pd.DatetimeIndex(_day_keys(trading_days).astype("datetime64[ns]"))
+    closes = (days + pd.Timedelta(f"{close_time}:00")).tz_localize(timezone)
+    return closes.tz_convert("UTC").as_unit("ns").asi8
+
+
+def align_to_sessions(timestamps, trading_days, timezone=EXCHANGE_TIMEZONE,
+                      close_time=CLOSE_TIME):
+    """Assign each news timestamp to the trading session it can affect.
+
+    A headline belongs to the first session whose close (``close_time`` in
+    ``timezone``) is strictly after it: news before the close counts for
+    that day, news at or after the close and on weekends or holidays rolls
+    forward to the next trading day. This is a forward as-of join on int64
+    keys (one ``searchsorted`` over the session closes). Naive timestamps
+    are taken to be UTC.
+
+    Headlines published before the first trading day, or after the last
+    close, have no session in the file and are dropped (NaT).
+
+    Returns the session day of every row (naive ``datetime64``, NaT when no
+    session applies) and the number of rows per rule.
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps))
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize("UTC")
+    day_keys = _day_keys(trading_days)
+    closes = session_closes(day_keys.astype("datetime64[ns]"), timezone, close_time)
+
+    missing = timestamps.isna().to_numpy()
+    nanos = _nanos(timestamps.dt.tz_convert("UTC").dt.tz_localize(None))
+    local_day = _nanos(timestamps.dt.tz_convert(timezone).dt.tz_localize(None).dt.normalize())
+    position = np.searchsorted(closes, nanos, side="right")
+    after_last = ~missing & (position == len(closes))
+    # News from before the first day in the price file has no session to affect
+    before_first = ~missing & ~after_last & (local_day < day_keys[0] if len(day_keys) else False)
+    matched = ~missing & ~after_last & ~before_first
+
+    sessions = np.full(len(nanos), np.iinfo(np.int64).min, dtype=np.int64)
+    sessions[matched] = day_keys[position[matched]]
+
+    # Which rule moved each headline: compare its exchange-local day with the session
+    rolled = matched & (sessions != local_day)
+    on_trading_day = np.isin(local_day, day_keys)
+    rule_masks = {
+        "same_session": matched & ~rolled,
+        "after_close": rolled & on_trading_day,
+        "non_trading_day": rolled & ~on_trading_day,
+        "before_first_session": before_first,
+        "after_last_session": after_last,
+        "missing_timestamp": missing,
+    }
+    counts = {rule: int(rule_masks[rule].sum()) for rule in SESSION_RULES}
+
+    session_days = pd.Series(
+        sessions.view("datetime64[ns]"), index=timestamps.index, name="session"
+    )
+    return session_days, counts
+
+
+def join_on_sessions(stock_df, daily_sentiment, date_column="Date"):
+    """Inner join of price rows with per-session sentiment on int64 day keys.
+
+    Both frames are keyed by day (``date`` objects or timestamps). The
+    sentiment keys are sorted once and every price row is looked up with
+    ``searchsorted``; the result has the price columns plus ``sentiment``,
+    in price-row order, like ``pd.merge(..., how="inner")``.
+    """
+    stock_keys = _nanos(pd.to_datetime(stock_df[date_column], format="mixed").dt.normalize())
+    sentiment_keys = _nanos(
+        pd.to_datetime(daily_sentiment[date_column], format="mixed").dt.normalize()
+    )
+
+    order = np.argsort(sentiment_keys, kind="stable")
+    sorted_keys = sentiment_keys[order]
+    found = np.zeros(len(stock_keys), dtype=bool)
+    position = np.zeros(len(stock_keys), dtype=np.int64)
+    if len(sorted_keys):
+        position = np.searchsorted(sorted_keys, stock_keys).clip(max=len(sorted_keys) - 1)
+        found = sorted_keys[position] == stock_keys
+
+    merged = stock_df[found].reset_index(drop=True)
+    merged["sentiment"] = daily_sentiment["sentiment"].to_numpy()[order[position[found]]]
+    return merged
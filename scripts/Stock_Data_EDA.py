@@ -1,23 +1,64 @@
 import os
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
+from scripts.Analysis_Graph import AnalysisGraph
+from scripts.Chart_Output import ChartOutput
+from scripts.Columnar_Store import is_dataset, load_prices, ticker_from_path
+from scripts.Technical_Indicators import macd, rsi, sma
+
 
 class EDA:
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, ticker=None, start=None, end=None, output_dir=None,
+                 formats=("png",)):
         self.file_path = file_path
+        self.ticker = ticker  # Only used with a columnar price dataset
+        self.start = start
+        self.end = end
         self.df = None  # Initialize df in __init__
+        # Indicators are cached per loaded frame and parameters
+        self.graph = AnalysisGraph()
+        self.graph.input("data")
+        self.graph.input("rsi_period", 14)
+        self.graph.input("sma_window", 50)
+        self.graph.input("macd_windows", (12, 26, 9))
+        self.graph.node("rsi", lambda df, period: rsi(df["Close"], period), ["data", "rsi_period"])
+        self.graph.node("sma", lambda df, window: sma(df["Close"], window), ["data", "sma_window"])
+        self.graph.node(
+            "macd", lambda df, windows: macd(df["Close"], *windows), ["data", "macd_windows"]
+        )
+
+        # With an output_dir charts are written to files instead of shown
+        prefix = ticker or ticker_from_path(file_path)
+        self.charts = ChartOutput(output_dir, formats=formats, prefix=prefix)
 
     def load_data(self):
         if not os.path.exists(self.file_path):
             print(f"File not found: {self.file_path}")
+        elif is_dataset(self.file_path):
+            if self.ticker is None:
+                print("A ticker is required to load from a price dataset.")
+                return
+            # Only the ticker partition and row groups in the date range are read
+            self.df = load_prices(self.file_path, self.ticker, self.start, self.end)
         else:
             self.df = pd.read_csv(self.file_path)
             self.df["Date"] = pd.to_datetime(self.df["Date"])
 
+    def indicator(self, name, **params):
+        """Cached ``"rsi"``, ``"sma"`` or ``"macd"`` of the loaded prices.
+
+        ``params`` (``rsi_period``, ``sma_window``, ``macd_windows``) replace
+        graph inputs; an indicator is recomputed only when its input changed.
+        """
+        # Loading or assigning a new frame invalidates every indicator
+        self.graph.set("data", self.df)
+        for param, value in params.items():
+            self.graph.set(param, value)
+        return self.graph.get(name)
+
     def descriptive_statistics(self):
         if self.df is not None:
             print("Descriptive Statistics: \n", self.df.describe())
@@ -45,112 +86,115 @@ class EDA:
     def plot_date_trends(self):
         if self.df is not None:
             self.df["year"] = self.df["Date"].dt.year
-            self.df.groupby("year").size().plot(kind="bar")
-            plt.title("Number of Data Points per Year")
-            plt.xlabel("Year")
-            plt.ylabel("Count")
-            plt.show()
+            fig = self.charts.figure()
+            ax = fig.subplots()
+            self.df.groupby("year").size().plot(kind="bar", ax=ax)
+            ax.set_title("Number of Data Points per Year")
+            ax.set_xlabel("Year")
+            ax.set_ylabel("Count")
+            return self.charts.finish(fig, "date_trends")
         else:
             print("No data loaded. please load the data first.")
 
     def plot_stock_prices(self):
         if self.df is not None:
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.df["Date"], self.df["Close"], label="Close Price")
-            plt.title("Stock Prices Over Time")
-            plt.xlabel("Date")
-            plt.ylabel("Close Price")
-            plt.legend()
-            plt.show()
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.plot(self.df["Date"], self.df["Close"], label="Close Price")
+            ax.set_title("Stock Prices Over Time")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Close Price")
+            ax.legend()
+            return self.charts.finish(fig, "stock_prices")
         else:
             print("No data loaded. please load the data first. \n")
 
     def plot_volume(self):
         if self.df is not None:
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.df["Date"], self.df["Volume"])
-            plt.title("Trading Volume Over Time")
-            plt.xlabel("Date")
-            plt.ylabel("Volume")
-            plt.ticklabel_format(style="plain", axis="y")
-            plt.legend()
-            plt.show()
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.plot(self.df["Date"], self.df["Volume"], label="Volume")
+            ax.set_title("Trading Volume Over Time")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Volume")
+            ax.ticklabel_format(style="plain", axis="y")
+            ax.legend()
+            return self.charts.finish(fig, "volume")
         else:
             print("No data loaded. Please load the data first.")
 
     def real_time_exchange_plot(self):
         if self.df is not None:
-            plt.figure(figsize=(10, 6))
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
             # Plot the closing prices
-            plt.plot(
+            ax.plot(
                 self.df["Date"], self.df["Close"], label="Close Price", color="blue"
             )
-            # Add volume bars on a secondary y-axis
-            ax2 = plt.gca().twinx()
-            ax2.bar(
+            # Add volume bars on a secondary y-axis; one line collection
+            # instead of a Rectangle per day keeps long histories fast to draw
+            ax2 = ax.twinx()
+            ax2.vlines(
                 self.df["Date"],
+                0,
                 self.df["Volume"],
                 color="gray",
                 alpha=0.3,
                 label="Volume",
             )
             ax2.set_ylabel("Volume")
-            plt.title("Stock Closing Price and Volume Over Time")
-            plt.xlabel("Date")
-            plt.ylabel("Close Price")
-            plt.legend(loc="upper left")
-            plt.show()
-            plt.clf()  # Clear the figure after displaying
+            ax.set_title("Stock Closing Price and Volume Over Time")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Close Price")
+            ax.legend(loc="upper left")
+            return self.charts.finish(fig, "price_and_volume")
         else:
             print("No data loaded. Please load the data first.")
             
     def plot_calculate_rsi(self, period=14):
         if self.df is not None:
-            delta = self.df['Close'].diff(1)
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            avg_gain = gain.rolling(window=period).mean()
-            avg_loss = loss.rolling(window=period).mean()
-            rs = avg_gain / avg_loss
-            self.df['RSI'] = 100 - (100 / (1 + rs))
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.df['Date'], self.df['RSI'], label='RSI')
-            plt.axhline(y=70, color='red', linestyle='--')
-            plt.axhline(y=30, color='green', linestyle='--')
-            plt.title('Relative Strength Index')
-            plt.xlabel('Date')
-            plt.ylabel('RSI')
-            plt.legend()
-            plt.show()
+            self.df['RSI'] = self.indicator("rsi", rsi_period=period)
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.plot(self.df['Date'], self.df['RSI'], label='RSI')
+            ax.axhline(y=70, color='red', linestyle='--')
+            ax.axhline(y=30, color='green', linestyle='--')
+            ax.set_title('Relative Strength Index')
+            ax.set_xlabel('Date')
+            ax.set_ylabel('RSI')
+            ax.legend()
+            return self.charts.finish(fig, "rsi")
         else:
             print("No data loaded. Please load the data first.")
             
     def calculate_moving_averages(self, window_size=50):
         if self.df is not None:
-            self.df[f'SMA_{window_size}'] = self.df['Close'].rolling(window=window_size).mean()
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.df['Date'], self.df['Close'], label='Close Price')
-            plt.plot(self.df['Date'], self.df[f'SMA_{window_size}'], label=f'SMA {window_size}')
-            plt.title(f'{window_size}-Day Simple Moving Average')
-            plt.xlabel('Date')
-            plt.ylabel('Price')
-            plt.legend()
-            plt.show()
+            self.df[f'SMA_{window_size}'] = self.indicator("sma", sma_window=window_size)
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.plot(self.df['Date'], self.df['Close'], label='Close Price')
+            ax.plot(self.df['Date'], self.df[f'SMA_{window_size}'], label=f'SMA {window_size}')
+            ax.set_title(f'{window_size}-Day Simple Moving Average')
+            ax.set_xlabel('Date')
+            ax.set_ylabel('Price')
+            ax.legend()
+            return self.charts.finish(fig, f"sma_{window_size}")
         else:
             print("No data loaded. Please load the data first.")
             
     def plot_calculate_macd(self, short_window=12, long_window=26, signal_window=9):
         if self.df is not None:
-            self.df['MACD'] = self.df['Close'].ewm(span=short_window, adjust=False).mean() - \
-                            self.df['Close'].ewm(span=long_window, adjust=False).mean()
-            self.df['Signal Line'] = self.df['MACD'].ewm(span=signal_window, adjust=False).mean()
-            plt.figure(figsize=(10, 6))
-            plt.plot(self.df['Date'], self.df['MACD'], label='MACD')
-            plt.plot(self.df['Date'], self.df['Signal Line'], label='Signal Line')
-            plt.title('MACD and Signal Line')
-            plt.xlabel('Date')
-            plt.ylabel('Value')
-            plt.legend()
-            plt.show()
+            self.df['MACD'], self.df['Signal Line'] = self.indicator(
+                "macd", macd_windows=(short_window, long_window, signal_window)
+            )
+            fig = self.charts.figure(figsize=(10, 6))
+            ax = fig.subplots()
+            ax.plot(self.df['Date'], self.df['MACD'], label='MACD')
+            ax.plot(self.df['Date'], self.df['Signal Line'], label='Signal Line')
+            ax.set_title('MACD and Signal Line')
+            ax.set_xlabel('Date')
+            ax.set_ylabel('Value')
+            ax.legend()
+            return self.charts.finish(fig, "macd")
         else:
             print("No data loaded. Please load the data first.")
@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+PUBLISHERS = [
+    "Paul Quintaro", "Lisa Levin", "Benzinga Newsdesk", "Charles Gross",
+    "Monica Gerson", "Eddie Staley", "Hal Lindon", "ETF Professor",
+    "Juan Lopez", "Benzinga Staff", "vick@benzinga.com", "webmaster@benzinga.com",
+    "Zacks", "Seeking Alpha", "Vick Meyer", "Shanthi Rexaline",
+]
+SUBJECTS = [
+    "Shares", "Stock", "Earnings", "Revenue", "Guidance", "Dividend", "Outlook",
+    "Analyst", "Price target", "Options activity", "Sales", "Margins",
+]
+VERBS = [
+    "rise", "fall", "beat", "miss", "jump", "slide", "hold", "surge", "drop",
+    "climb", "trade", "open",
+]
+QUALIFIERS = [
+    "strong", "weak", "record", "disappointing", "impressive", "poor", "higher",
+    "lower", "great", "terrible", "mixed", "solid", "bad", "good", "new",
+]
+ENDINGS = [
+    "after earnings", "in premarket", "on heavy volume", "ahead of the report",
+    "on upgrade", "on downgrade", "for the quarter", "this week", "amid selloff",
+    "in late trading",
+]
+
+# Share of generated news dates in each format handled by DateNormalizer
+DATE_FORMAT_MIX = {
+    "iso_offset": 0.05,
+    "iso_seconds": 0.85,
+    "us_minute": 0.04,
+    "iso_date": 0.03,
+    "us_date": 0.03,
+}
+
+
+def make_tickers(n_tickers):
+    """Distinct synthetic ticker symbols (AAAA, AAAB, ...)."""
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    codes = np.arange(n_tickers)
+    symbol = np.empty(n_tickers, dtype=object)
+    symbol[:] = ""
+    for _ in range(4):
+        symbol = letters[codes % 26].astype(object) + symbol
+        codes //= 26
+    return list(symbol)
+
+
+def _format_dates(stamps, formats):
+    """Render epoch-second stamps in the named date formats."""
+    # numpy renders ISO strings far faster than strftime
+    iso = pd.Series(
+        stamps.astype("datetime64[s]").astype(str), dtype=object
+    ).str.replace("T", " ", regex=False)
+    dates = iso.copy()
+
+    offset = formats == "iso_offset"
+    dates[offset] = iso[offset] + "-04:00"
+    iso_date = formats == "iso_date"
+    dates[iso_date] = iso[iso_date].str[:10]
+
+    us = (formats == "us_minute") | (formats == "us_date")
+    moments = pd.DatetimeIndex(stamps[us].astype("datetime64[s]"))
+    us_day = (
+        pd.Series(moments.month, dtype=object).astype(str) + "/"
+        + pd.Series(moments.day, dtype=object).astype(str) + "/"
+        + pd.Series(moments.year, dtype=object).astype(str)
+    ).to_numpy()
+    minute = formats[us] == "us_minute"
+    us_day[minute] = us_day[minute] + " " + iso[us].str[11:16].to_numpy()[minute]
+    dates[us] = us_day
+    return dates
+
+
+def generate_news(rows, tickers=None, start="2011-01-01", end="2020-06-11",
+                  unique_headlines=50_000, seed=0):
+    """Seeded news feed in the raw analyst ratings layout.
+
+    Columns are headline, url, publisher, date and stock. Headlines are drawn
+    from a pool of ``unique_headlines`` template sentences (real feeds repeat
+    headlines too) and dates are mixed across the formats in
+    ``DATE_FORMAT_MIX``.
+    """
+    rng = np.random.default_rng(seed)
+    tickers = tickers or make_tickers(100)
+
+    # Pool of template headlines, sampled per row
+    pool_size = max(1, min(rows, unique_headlines))
+    pool = pd.Series(rng.choice(SUBJECTS, pool_size), dtype=object)
+    for words in (VERBS, QUALIFIERS, ENDINGS):
+        pool = pool + " " + pd.Series(rng.choice(words, pool_size), dtype=object)
+    headlines = pool.to_numpy()[rng.integers(0, pool_size, rows)]
+
+    first = pd.Timestamp(start).value // 10**9
+    last = pd.Timestamp(end).value // 10**9
+    stamps = np.sort(rng.integers(first, last, rows))
+    formats = rng.choice(list(DATE_FORMAT_MIX), rows, p=list(DATE_FORMAT_MIX.values()))
+
+    return pd.DataFrame({
+        "headline": headlines,
+        "url": "https://www.benzinga.com/news",
+        "publisher": rng.choice(PUBLISHERS, rows),
+        "date": _format_dates(stamps, formats).to_numpy(),
+        "stock": rng.choice(np.array(tickers, dtype=object), rows),
+    })
+
+
+def generate_prices(rows, n_tickers=None, start="2011-01-03", seed=0):
+    """Seeded daily OHLCV bars for many tickers as one long frame.
+
+    ``rows`` bars are split evenly over ``n_tickers`` (by default one ticker
+    per ten years of business days) sharing one business-day calendar.
+    Columns follow the yfinance files plus a Ticker column.
+    """
+    rng = np.random.default_rng(seed)
+    n_tickers = n_tickers or max(1, rows // 2520)
+    days = max(2, rows // n_tickers)
+    dates = pd.bdate_range(start, periods=days)
+
+    # Geometric random walk per ticker
+    log_returns = rng.normal(0.0003, 0.02, (days, n_tickers))
+    close = 50 * np.exp(np.cumsum(log_returns, axis=0))
+    spread = np.abs(rng.normal(0, 0.01, (days, n_tickers)))
+    open_ = close * (1 + rng.normal(0, 0.005, (days, n_tickers)))
+
+    return pd.DataFrame({
+        "Date": np.repeat(dates.to_numpy(), n_tickers),
+        "Ticker": np.tile(np.array(make_tickers(n_tickers), dtype=object), days),
+        "Open": open_.ravel(),
+        "High": (np.maximum(open_, close) * (1 + spread)).ravel(),
+        "Low": (np.minimum(open_, close) * (1 - spread)).ravel(),
+        "Close": close.ravel(),
+        "Adj Close": close.ravel(),
+        "Volume": rng.integers(100_000, 50_000_000, days * n_tickers),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    })
+
+
+def write_price_csvs(prices, directory):
+    """Write one ``<TICKER>_historical_data.csv`` per ticker and return the paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for ticker, bars in prices.groupby("Ticker", sort=True):
+        path = os.path.join(directory, f"{ticker}_historical_data.csv")
+        bars.drop(columns="Ticker").to_csv(path, index=False, date_format="%Y-%m-%d")
+        paths.append(path)
+    return paths
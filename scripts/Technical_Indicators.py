@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from scripts.Columnar_Store import is_dataset, load_prices, ticker_from_path
+
+
+def load_price_panel(price_files, field="Close", tickers=None):
+    """Load one price field of many tickers as a wide panel.
+
+    ``price_files`` is a list of ``<TICKER>_historical_data.csv`` paths or a
+    columnar price dataset directory (then ``tickers`` is required). Returns
+    a frame with dates as rows and tickers as columns.
+    """
+    columns = {}
+    if isinstance(price_files, str) and is_dataset(price_files):
+        for ticker in tickers:
+            prices = load_prices(price_files, ticker, columns=["Date", field])
+            columns[ticker] = prices.set_index("Date")[field]
+    else:
+        for path in price_files:
+            prices = pd.read_csv(path, usecols=["Date", field])
+            prices["Date"] = pd.to_datetime(prices["Date"], format="mixed")
+            columns[ticker_from_path(path)] = prices.set_index("Date")[field]
+    return pd.DataFrame(columns).sort_index()
+
+
+def rsi(close, period=14):
+    """Relative Strength Index from simple rolling means of gains and losses.
+
+    Works on a Series or on a whole panel (one column per ticker).
+    """
+    delta = close.diff(1)
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=period).mean()
+    avg_loss = loss.rolling(window=period).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def sma(close, window=50):
+    """Simple moving average over ``window`` rows."""
+    return close.rolling(window=window).mean()
+
+
+def macd(close, short_window=12, long_window=26, signal_window=9):
+    """MACD line and its signal line."""
+    macd_line = (
+        close.ewm(span=short_window, adjust=False).mean()
+        - close.ewm(span=long_window, adjust=False).mean()
+    )
+    signal_line = macd_line.ewm(span=signal_window, adjust=False).mean()
+    return macd_line, signal_line
+
+
+def compute_indicators(close_panel, rsi_period=14, sma_windows=(20, 50, 200),
+                       macd_windows=(12, 26, 9), dtype=np.float32):
+    """Compute RSI, SMAs and MACD/signal for every ticker of a close panel.
+
+    Each indicator is one vectorized pass over the whole panel (tickers as
+    columns), computed in float64 and stored as ``dtype`` (float32 by
+    default). Returns a frame with (indicator, ticker) column levels, e.g.
+    ``result["RSI"]`` or ``result["SMA_50"]["AAPL"]``. The panel rows should
+    share one trading calendar; gaps inside a ticker's history are treated
+    as missing bars.
+    """
+    close_panel = close_panel.astype(np.float64)
+    indicators = {"RSI": rsi(close_panel, rsi_period)}
+    for window in sma_windows:
+        indicators[f"SMA_{window}"] = sma(close_panel, window)
+    macd_line, signal_line = macd(close_panel, *macd_windows)
+    indicators["MACD"] = macd_line
+    indicators["Signal Line"] = signal_line
+
+    result = pd.concat(indicators, axis=1, names=["indicator", "ticker"])
+    return result.astype(dtype)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+class HeadlineTopicModel:
+    """Online LDA topic model over hashed headline term counts.
+
+    Headlines are turned into sparse term counts with a ``HashingVectorizer``
+    (a fixed ``n_features`` columns, no vocabulary kept in memory) one batch
+    at a time, and the model is updated with ``partial_fit`` per batch, so
+    memory is bounded by ``batch_size`` rather than the corpus size. The
+    E-step of each batch runs on ``n_jobs`` cores (all cores by default).
+    Repeated headlines are labelled once. Term names for ``top_terms`` come
+    from the tokens of the first batch only.
+    """
+
+    def __init__(self, n_topics=10, n_features=2 ** 18, batch_size=50_000, n_jobs=None,
+                 passes=1, random_state=0, max_term_names=200_000):
+        self.n_topics = n_topics
+        self.batch_size = batch_size
+        self.passes = passes
+        self.max_term_names = max_term_names
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, stop_words="english", alternate_sign=False, norm=None,
+        )
+        self.model = LatentDirichletAllocation(
+            n_components=n_topics, learning_method="online", batch_size=batch_size,
+            n_jobs=-1 if n_jobs is None else n_jobs, random_state=random_state,
+        )
+        self.term_names = {}  # hashed column -> a token seen in it
+
+    def _batches(self, headlines):
+        headlines = pd.Series(headlines).fillna("").astype(str)
+        for start in range(0, len(headlines), self.batch_size):
+            yield headlines.iloc[start:start + self.batch_size].tolist()
+
+    def _name_terms(self, batch):
+        """Remember which token each hashed column stands for (bounded)."""
+        analyzer = self.vectorizer.build_analyzer()
+        tokens = set()
+        for headline in batch:
+            tokens.update(analyzer(headline))
+            if len(tokens) >= self.max_term_names:
+                break
+        tokens = sorted(tokens)
+        if tokens:
+            columns = self.vectorizer.transform(tokens).indices
+            self.term_names.update(zip(columns.tolist(), tokens))
+
+    def partial_fit(self, headlines):
+        """Update the model with one batch of headlines."""
+        if not self.term_names:
+            self._name_terms(headlines)
+        self.model.partial_fit(self.vectorizer.transform(headlines))
+        return self
+
+    def fit(self, headlines):
+        """Fit on all headlines, ``passes`` times over, one batch at a time."""
+        for _ in range(self.passes):
+            for batch in self._batches(headlines):
+                self.partial_fit(batch)
+        return self
+
+    def fit_csv(self, file_path, column="headline"):
+        """Fit on a news CSV read in ``batch_size`` chunks."""
+        for _ in range(self.passes):
+            for chunk in pd.read_csv(file_path, usecols=[column], chunksize=self.batch_size):
+                self.partial_fit(chunk[column].fillna("").astype(str).tolist())
+        return self
+
+    def transform(self, headlines):
+        """Topic id of every headline (its most probable topic)."""
+        codes, uniques = pd.factorize(pd.Series(headlines).fillna("").astype(str))
+        topics = [
+            self.model.transform(self.vectorizer.transform(batch)).argmax(axis=1)
+            for batch in self._batches(uniques)
+        ]
+        if not topics:
+            return np.empty(0, dtype=np.int16)
+        return np.concatenate(topics).astype(np.int16)[codes]
+
+    def top_terms(self, n_terms=10):
+        """The highest-weight known terms of each topic."""
+        rows = []
+        for topic, weights in enumerate(self.model.components_):
+            terms = []
+            for column in np.argsort(weights)[::-1]:
+                if column in self.term_names:
+                    terms.append(self.term_names[column])
+                    if len(terms) == n_terms:
+                        break
+            rows.append({"topic": topic, "terms": ", ".join(terms)})
+        return pd.DataFrame(rows).set_index("topic")
+
+
+def topic_daily_sentiment(days, topics, sentiment):
+    """Mean sentiment and article count per (day, topic), as a tidy frame."""
+    frame = pd.DataFrame({
+        "Date": np.asarray(days),
+        "topic": np.asarray(topics),
+        "sentiment": np.asarray(sentiment, dtype=np.float64),
+    })
+    daily = frame.groupby(["Date", "topic"])["sentiment"].agg(["mean", "size"])
+    return daily.rename(columns={"mean": "sentiment", "size": "articles"}).reset_index()
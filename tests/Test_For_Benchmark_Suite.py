@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.Benchmark_Suite import compare_results, run_benchmarks
+from scripts.Date_Normalizer import DATE_FORMATS, DateNormalizer
+from scripts.Synthetic_Data import generate_news, generate_prices
+
+
+class TestSyntheticData(unittest.TestCase):
+
+    def test_generators_are_seeded(self):
+        """Test the same seed gives the same data"""
+        self.assertTrue(generate_news(500, seed=3).equals(generate_news(500, seed=3)))
+        self.assertTrue(generate_prices(5000, seed=3).equals(generate_prices(5000, seed=3)))
+
+    def test_news_dates_use_every_handled_format(self):
+        """Test generated dates cover the formats DateNormalizer parses explicitly"""
+        news = generate_news(2000)
+        normalizer = DateNormalizer()
+        dates = normalizer.normalize(news["date"])
+        self.assertFalse(dates.isna().any(), "Every generated date should parse.")
+        for name, _, _ in DATE_FORMATS:
+            self.assertGreater(normalizer.last_stats.get(name, 0), 0, f"No dates in format {name}.")
+
+    def test_prices_are_valid_ohlcv(self):
+        """Test generated bars keep Low <= Open, Close <= High"""
+        prices = generate_prices(5040)
+        self.assertEqual(prices["Ticker"].nunique(), 2)
+        self.assertTrue((prices["Low"] <= prices[["Open", "Close"]].min(axis=1)).all())
+        self.assertTrue((prices["High"] >= prices[["Open", "Close"]].max(axis=1)).all())
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_results_file_covers_every_stage(self):
+        """Test a small run writes timings and memory for every stage"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "results.json")
+            run_benchmarks(sizes=(3000,), output_path=output_path, n_workers=1)
+
+            with open(output_path) as f:
+                results = json.load(f)
+            stages = [record["stage"] for record in results["results"]]
+            self.assertEqual(stages, [
+                "load_news", "load_prices", "dates", "sessions", "sentiment",
+                "aggregation", "merge", "correlation", "indicators",
+            ])
+            self.assertTrue(all(record["peak_mb"] is not None for record in results["results"]))
+
+            comparison = compare_results(output_path, output_path)
+            self.assertTrue((comparison["time_ratio"] == 1).all(), "A run compared with itself should match.")
+
+    def test_publication_days_skip_the_session_stage(self):
+        """Test a run without session alignment times the publication-day path"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "results.json")
+            results = run_benchmarks(sizes=(3000,), output_path=output_path, n_workers=1,
+                                     trace_memory=False, align_sessions=False)
+
+            stages = [record["stage"] for record in results["results"]]
+            self.assertNotIn("sessions", stages)
+            merge = next(record for record in results["results"] if record["stage"] == "merge")
+            correlation = next(
+                record for record in results["results"] if record["stage"] == "correlation"
+            )
+            self.assertGreater(correlation["rows"], 0, "Sentiment days should join the returns.")
+            self.assertLessEqual(correlation["rows"], merge["rows"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from scripts.Columnar_Store import convert_news_csv, convert_price_csvs, load_news, load_prices
+from scripts.Stock_Data_EDA import EDA
+from tests.Test_For_News_Analysis import make_news_csv
+
+
+class TestColumnarStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Convert a synthetic news file and two price files"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        root = cls.tmp_dir.name
+        cls.news_csv = os.path.join(root, "news.csv")
+        make_news_csv(cls.news_csv, rows=200)
+        cls.news_dir = os.path.join(root, "news")
+        convert_news_csv(cls.news_csv, cls.news_dir, chunk_size=64)
+
+        cls.prices_dir = os.path.join(root, "prices")
+        price_files = []
+        for ticker, date_format in [("AAPL", "%m/%d/%Y"), ("TSLA", "%Y-%m-%d")]:
+            path = os.path.join(root, f"{ticker}_historical_data.csv")
+            dates = pd.date_range("2022-01-01", periods=100, freq="D")
+            pd.DataFrame({
+                "Date": dates.strftime(date_format),
+                "Close": range(100),
+                "Volume": range(100, 200),
+            }).to_csv(path, index=False)
+            price_files.append(path)
+        convert_price_csvs(price_files, cls.prices_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def test_news_roundtrip(self):
+        """Test converted news keeps every row with parsed dates and categories"""
+        news_df = load_news(self.news_dir)
+        self.assertEqual(len(news_df), 200, "Every row should be converted.")
+        self.assertEqual(str(news_df["date"].dtype), "datetime64[ns, UTC]")
+        self.assertIsInstance(news_df["publisher"].dtype, pd.CategoricalDtype)
+
+    def test_news_filters(self):
+        """Test ticker and date filters only return matching rows"""
+        news_df = load_news(self.news_dir, tickers=["TSLA"], start="2020-06-01", end="2020-06-30")
+        self.assertGreater(len(news_df), 0, "Some rows should match.")
+        self.assertTrue((news_df["stock"] == "TSLA").all())
+        self.assertTrue(news_df["date"].between(
+            pd.Timestamp("2020-06-01", tz="UTC"), pd.Timestamp("2020-07-01", tz="UTC"),
+            inclusive="left",
+        ).all())
+
+    def test_date_only_end_includes_the_whole_day(self):
+        """Test headlines published during the end date are kept"""
+        csv_path = os.path.join(self.tmp_dir.name, "end_day.csv")
+        pd.DataFrame({
+            "headline": ["before", "on the end day", "after"],
+            "publisher": "Zacks",
+            "date": ["2020-06-29 15:00:00", "2020-06-30 14:30:00", "2020-07-01 09:00:00"],
+            "stock": "AAPL",
+        }).to_csv(csv_path, index=False)
+        dataset_dir = os.path.join(self.tmp_dir.name, "end_day")
+        convert_news_csv(csv_path, dataset_dir)
+
+        news_df = load_news(dataset_dir, end="2020-06-30")
+        self.assertEqual(list(news_df["headline"]), ["before", "on the end day"])
+        news_df = load_news(dataset_dir, end="2020-06-30 12:00")
+        self.assertEqual(list(news_df["headline"]), ["before"], "A time of day stays inclusive.")
+
+    def test_sorted_by_instant_and_reconverted_cleanly(self):
+        """Test mixed formats sort by parsed time and a smaller rerun leaves no stale rows"""
+        csv_path = os.path.join(self.tmp_dir.name, "mixed.csv")
+        pd.DataFrame({
+            "headline": ["a", "b", "c", "d"],
+            "publisher": "Zacks",
+            "date": ["6/5/2020 10:30", "2020-06-04 23:00:00-04:00", "2020-06-05 09:00:00+00:00", "12/1/2020 8:00"],
+            "stock": "AAPL",
+        }).to_csv(csv_path, index=False)
+        dataset_dir = os.path.join(self.tmp_dir.name, "mixed")
+        convert_news_csv(self.news_csv, dataset_dir, chunk_size=64)
+        convert_news_csv(csv_path, dataset_dir)
+
+        news_df = load_news(dataset_dir)
+        self.assertEqual(list(news_df["headline"]), ["b", "c", "a", "d"], "Rows should be in time order.")
+        self.assertEqual(list(news_df["utc_offset"]), [-240, 0, 0, 0])
+
+    def test_prices_by_ticker_and_range(self):
+        """Test price loading by ticker and date range, also through EDA"""
+        prices = load_prices(self.prices_dir, "tsla", start="2022-02-01", end="2022-02-10")
+        self.assertEqual(len(prices), 10, "Ten days should be selected.")
+
+        eda = EDA(self.prices_dir, ticker="AAPL")
+        eda.load_data()
+        self.assertEqual(len(eda.df), 100, "The whole AAPL history should load.")
+        self.assertEqual(eda.df["Date"].iloc[0], pd.Timestamp("2022-01-01"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,401 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from scripts.Analysis_Graph import AnalysisGraph
+from scripts.Columnar_Store import convert_news_csv, load_news
+from scripts.CorrelationBetweenStockAndNews import CombinedAnalysis
+from scripts.Incremental_Correlation import IncrementalCorrelation
+from scripts.Instrumentation import Profiler
+from scripts.Multi_Ticker_Correlation import MultiTickerAnalysis
+from scripts.Rolling_Correlation import rolling_lagged_correlation
+from scripts.Sentiment_Backtest import METRICS, SentimentBacktest
+from scripts.Sentiment_Engine import SentimentEngine
+from scripts.Session_Alignment import align_to_sessions, join_on_sessions
+from tests.Test_For_News_Analysis import make_news_csv
+
+
+def make_price_csv(path, seed, periods=160):
+    """Write a synthetic <TICKER>_historical_data.csv price file"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-05-25", periods=periods)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, periods))
+    pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Close": close,
+        "Volume": rng.integers(1_000, 2_000, periods),
+    }).to_csv(path, index=False)
+
+
+class CorrelationTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a news file (with a 'Date' column) and two price files"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        root = cls.tmp_dir.name
+        raw_news = os.path.join(root, "raw_news.csv")
+        make_news_csv(raw_news, rows=400)
+        cls.news_df = pd.read_csv(raw_news).rename(columns={"date": "Date"})
+        cls.news_file = os.path.join(root, "news.csv")
+        cls.news_df.to_csv(cls.news_file, index=False)
+
+        cls.stock_files = {}
+        for seed, ticker in enumerate(["AAPL", "TSLA"]):
+            path = os.path.join(root, f"{ticker}_historical_data.csv")
+            make_price_csv(path, seed)
+            cls.stock_files[ticker] = path
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def combined_analysis(self, ticker, own_news_only=True):
+        """Run the single-ticker pipeline, by default on that ticker's news only"""
+        path = self.news_file
+        if own_news_only:
+            path = os.path.join(self.tmp_dir.name, f"news_{ticker}.csv")
+            self.news_df[self.news_df["stock"] == ticker].to_csv(path, index=False)
+        analysis = CombinedAnalysis(path, self.stock_files[ticker])
+        analysis.normalize_dates()
+        analysis.analyze_sentiment(n_workers=1)
+        analysis.calculate_daily_returns()
+        return analysis
+
+
+class TestMultiTickerAnalysis(CorrelationTestCase):
+
+    def test_matches_single_ticker_runs(self):
+        """Test one multi-ticker pass equals one CombinedAnalysis per ticker"""
+        analysis = MultiTickerAnalysis(self.news_file, list(self.stock_files.values()), n_workers=2)
+        analysis.normalize_dates()
+        analysis.analyze_sentiment(n_workers=1)
+        returns = analysis.calculate_daily_returns()
+        table = analysis.correlate_with_sentiment()
+
+        self.assertEqual(list(returns.columns), ["AAPL", "TSLA"], "Returns should be one wide frame.")
+        for ticker in self.stock_files:
+            correlation, merged_df = self.combined_analysis(ticker).correlate_with_sentiment()
+            self.assertAlmostEqual(table.loc[ticker, "correlation"], correlation)
+            self.assertEqual(table.loc[ticker, "observations"], merged_df["Daily_Return"].notna().sum())
+
+
+    def test_price_dataset_needs_tickers(self):
+        """Test a price dataset without a ticker list fails with a clear error"""
+        with self.assertRaisesRegex(ValueError, "tickers is required"):
+            MultiTickerAnalysis(self.news_file, self.tmp_dir.name)
+
+
+class TestIncrementalCorrelation(CorrelationTestCase):
+
+    def test_deltas_match_full_recompute(self):
+        """Test history plus deltas (with a save/load in between) equals a full run"""
+        state = IncrementalCorrelation()
+        engine = SentimentEngine(n_workers=1)
+        state.apply_news(self.news_df.iloc[:300], engine=engine)
+        prices = {ticker: pd.read_csv(path) for ticker, path in self.stock_files.items()}
+        for ticker, price_df in prices.items():
+            state.apply_prices(ticker, price_df.iloc[:120])
+
+        state_path = os.path.join(self.tmp_dir.name, "state.json")
+        state.save(state_path)
+        state = IncrementalCorrelation.load(state_path)
+
+        state.apply_news(self.news_df.iloc[300:], engine=engine)
+        for ticker, price_df in prices.items():
+            state.apply_prices(ticker, price_df.iloc[110:])  # overlapping bars are skipped
+
+        for ticker in self.stock_files:
+            analysis = self.combined_analysis(ticker, own_news_only=False)
+            correlation, _ = analysis.correlate_with_sentiment()
+            self.assertAlmostEqual(state.correlation(ticker), correlation)
+            np.testing.assert_allclose(
+                state.daily_sentiment()["sentiment"], analysis.daily_sentiment["sentiment"]
+            )
+            np.testing.assert_allclose(
+                state.daily_returns(ticker)["Daily_Return"],
+                analysis.stock_df["Daily_Return"].dropna(),
+            )
+
+
+    def test_parsed_dates_use_the_published_offset(self):
+        """Test columnar-store news is bucketed like the raw strings it came from"""
+        raw_news = os.path.join(self.tmp_dir.name, "raw_news_offset.csv")
+        make_news_csv(raw_news, rows=120, offset="-04:00")
+        dataset_dir = os.path.join(self.tmp_dir.name, "news_offset")
+        convert_news_csv(raw_news, dataset_dir)
+        news_df = pd.read_csv(raw_news)
+        news_df["sentiment"] = np.linspace(-1, 1, len(news_df))
+        stored = load_news(dataset_dir)
+        stored["sentiment"] = news_df["sentiment"]  # same rows, in time order
+
+        from_strings = IncrementalCorrelation()
+        from_strings.apply_news(news_df, date_column="date")
+        from_store = IncrementalCorrelation()
+        from_store.apply_news(stored, date_column="date")
+        pd.testing.assert_frame_equal(from_store.daily_sentiment(), from_strings.daily_sentiment())
+
+
+class TestRollingCorrelation(CorrelationTestCase):
+
+    def test_matches_brute_force_windows(self):
+        """Test cumulative-sum windows equal a direct Pearson per window"""
+        rng = np.random.default_rng(1)
+        sentiment = rng.normal(size=300)
+        sentiment[rng.random(300) < 0.3] = np.nan
+        returns = 0.3 * np.roll(np.nan_to_num(sentiment), 2) + rng.normal(size=300)
+        dates = pd.bdate_range("2020-01-01", periods=300)
+
+        result = rolling_lagged_correlation(dates, sentiment, returns, windows=[20, 60], lags=[0, 2])
+        for (window, lag), group in result.groupby(["window", "lag"]):
+            self.assertEqual(len(group), 300 - window + 1, "One row per full window expected.")
+            for end in [window - 1, 150, 299]:
+                x = sentiment[end - window + 1:end + 1]
+                y = np.append(returns, [np.nan] * lag)[end - window + 1 + lag:end + 1 + lag]
+                valid = ~np.isnan(x) & ~np.isnan(y)
+                expected = np.corrcoef(x[valid], y[valid])[0, 1]
+                row = group[group["Date"] == dates[end]].iloc[0]
+                self.assertAlmostEqual(row["correlation"], expected)
+                self.assertEqual(row["observations"], valid.sum())
+
+    def test_combined_analysis_sweep(self):
+        """Test the CombinedAnalysis method returns one tidy frame per sweep"""
+        analysis = self.combined_analysis("AAPL", own_news_only=False)
+        result = analysis.rolling_lagged_correlations(windows=[10, 30], lags=[0, 1, 2])
+        self.assertEqual(set(result["window"]), {10, 30})
+        self.assertEqual(set(result["lag"]), {0, 1, 2})
+        self.assertTrue(result["correlation"].dropna().between(-1, 1).all())
+
+class TestInstrumentation(CorrelationTestCase):
+
+    def test_profiles_every_stage(self):
+        """Test each public method call is recorded with time, rows and memory"""
+        profiler = Profiler(trace_memory=True)
+        analysis = profiler.create(CombinedAnalysis, self.news_file, self.stock_files["AAPL"])
+        analysis.normalize_dates()
+        analysis.analyze_sentiment(n_workers=1)
+        analysis.calculate_daily_returns()
+        correlation, _ = analysis.correlate_with_sentiment()
+
+        report = profiler.report()
+        self.assertEqual(list(report["name"]), [
+            "CombinedAnalysis.__init__", "CombinedAnalysis.normalize_dates",
+            "CombinedAnalysis.analyze_sentiment", "CombinedAnalysis.calculate_daily_returns",
+            "CombinedAnalysis.correlate_with_sentiment",
+        ])
+        self.assertEqual(report["rows"].iloc[0], 400 + 160, "Rows should count news and stock frames.")
+        self.assertTrue((report["seconds"] >= 0).all() and report["peak_mb"].notna().all())
+        self.assertFalse(np.isnan(correlation), "Wrapped methods should still return their results.")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = profiler.export_chrome_trace(os.path.join(tmp_dir, "trace.json"))
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), 5)
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+
+    def test_debug_output_goes_through_logging(self):
+        """Test column dumps are debug log records instead of prints"""
+        with self.assertLogs("scripts.CorrelationBetweenStockAndNews", level=logging.DEBUG) as logs:
+            CombinedAnalysis(self.news_file, self.stock_files["AAPL"]).normalize_dates()
+        self.assertTrue(any("Stock DataFrame columns" in line for line in logs.output))
+
+
+class TestSessionAlignment(CorrelationTestCase):
+
+    def test_rules_roll_news_forward(self):
+        """Test after-close, weekend and holiday news move to the next session"""
+        trading_days = pd.to_datetime(["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-05", "2024-07-08"])
+        timestamps = pd.Series(pd.to_datetime([
+            "2024-07-01 15:59:00-04:00",  # before the close
+            "2024-07-01 16:00:00-04:00",  # at the close
+            "2024-07-03 20:00:00-04:00",  # after close, next day is a holiday
+            "2024-07-06 12:00:00+00:00",  # Saturday
+            "2024-07-08 21:00:00+00:00",  # after the last close in the file
+            None,
+        ], utc=True, format="mixed"))
+
+        sessions, counts = align_to_sessions(timestamps, trading_days)
+        expected = pd.to_datetime(["2024-07-01", "2024-07-02", "2024-07-05", "2024-07-08", None, None])
+        np.testing.assert_array_equal(sessions.to_numpy(), expected.to_numpy())
+        self.assertEqual(counts, {
+            "same_session": 1, "after_close": 2, "non_trading_day": 1,
+            "before_first_session": 0, "after_last_session": 1, "missing_timestamp": 1,
+        })
+
+    def test_news_before_the_first_bar_is_dropped(self):
+        """Test headlines older than the price file are not piled onto its first session"""
+        trading_days = pd.to_datetime(["2012-05-18", "2012-05-21", "2012-05-22"])
+        timestamps = pd.Series(pd.to_datetime([
+            "2010-03-01 10:00:00-05:00",
+            "2011-06-01 10:00:00-04:00",
+            "2012-05-17 20:00:00-04:00",  # evening before the first bar
+            "2012-05-18 09:00:00-04:00",
+        ], utc=True, format="mixed"))
+
+        sessions, counts = align_to_sessions(timestamps, trading_days)
+        expected = pd.to_datetime([None, None, None, "2012-05-18"])
+        np.testing.assert_array_equal(sessions.to_numpy(), expected.to_numpy())
+        self.assertEqual(counts["before_first_session"], 3)
+        self.assertEqual(counts["non_trading_day"], 0, "Old news should not count as rolled forward.")
+        self.assertEqual(counts["same_session"], 1)
+
+    def test_int64_join_matches_merge(self):
+        """Test the sorted session join returns the rows of an inner merge"""
+        analysis = self.combined_analysis("AAPL")
+        expected = pd.merge(analysis.stock_df, analysis.daily_sentiment, on="Date", how="inner")
+        pd.testing.assert_frame_equal(join_on_sessions(analysis.stock_df, analysis.daily_sentiment), expected)
+
+    def test_combined_analysis_option(self):
+        """Test CombinedAnalysis aligns every headline and reports the rules"""
+        analysis = CombinedAnalysis(self.news_file, self.stock_files["AAPL"], align_sessions=True)
+        analysis.normalize_dates()
+        analysis.analyze_sentiment(n_workers=1)
+        analysis.calculate_daily_returns()
+        correlation, merged = analysis.correlate_with_sentiment()
+
+        self.assertEqual(sum(analysis.session_stats.values()), len(analysis.news_df))
+        self.assertGreater(analysis.session_stats["non_trading_day"], 0, "Weekend news should roll forward.")
+        trading_days = set(analysis.stock_df["Date"])
+        self.assertTrue(set(analysis.daily_sentiment["Date"]) <= trading_days)
+        self.assertEqual(len(merged), len(analysis.daily_sentiment))
+        self.assertTrue(-1 <= correlation <= 1)
+
+
+class TestAnalysisGraph(CorrelationTestCase):
+
+    def test_invalidates_only_downstream(self):
+        """Test a changed input recomputes its dependents and nothing else"""
+        graph = AnalysisGraph()
+        graph.input("a", 1)
+        graph.input("b", 2)
+        graph.node("double", lambda a: 2 * a, ["a"])
+        graph.node("total", lambda double, b: double + b, ["double", "b"])
+        self.assertEqual(graph.get("total"), 4)
+
+        graph.set("b", 10)
+        self.assertTrue(graph.is_cached("double"), "Nodes upstream of b should be kept.")
+        self.assertEqual(graph.get("total"), 12)
+        graph.set("b", 10)  # unchanged value
+        self.assertTrue(graph.is_cached("total"))
+        self.assertEqual(graph.computations, {"double": 1, "total": 2})
+        self.assertEqual(graph.downstream("a"), {"double", "total"})
+
+    def test_combined_analysis_computes_lazily(self):
+        """Test asking for the correlation first runs each stage once"""
+        stepwise = self.combined_analysis("AAPL", own_news_only=False)
+        expected, _ = stepwise.correlate_with_sentiment()
+
+        analysis = CombinedAnalysis(self.news_file, self.stock_files["AAPL"])
+        analysis.engine_options["n_workers"] = 1
+        correlation, merged = analysis.correlate_with_sentiment()
+        self.assertAlmostEqual(correlation, expected)
+        analysis.correlate_with_sentiment()
+        analysis.analyze_sentiment(n_workers=1)
+        self.assertTrue(all(count == 1 for count in analysis.graph.computations.values()))
+
+        # A new price file re-joins without re-scoring the headlines
+        analysis.set_stock_file(self.stock_files["TSLA"])
+        correlation, _ = analysis.correlate_with_sentiment()
+        self.assertEqual(analysis.graph.computations["scores"], 1, "Headlines should not be re-scored.")
+        self.assertEqual(analysis.graph.computations["returns"], 2)
+        self.assertAlmostEqual(correlation, self.combined_analysis("TSLA", own_news_only=False)
+                               .correlate_with_sentiment()[0])
+
+
+class TestSentimentBacktest(CorrelationTestCase):
+
+    def test_matches_day_by_day_simulation(self):
+        """Test the vectorized positions and P&L equal a loop over days"""
+        rng = np.random.default_rng(3)
+        dates = pd.bdate_range("2021-01-01", periods=120)
+        returns = pd.DataFrame(rng.normal(0, 0.01, (120, 3)), index=dates, columns=list("ABC"))
+        sentiment = pd.DataFrame(rng.normal(0, 0.2, (120, 3)), index=dates, columns=list("ABC"))
+        sentiment = sentiment.where(rng.random((120, 3)) < 0.6)
+        backtest = SentimentBacktest(sentiment, returns, trim=False)
+
+        threshold, holding, cost = 0.1, 3, 0.001
+        signal = sentiment.to_numpy()
+        entries = (signal > threshold).astype(float) - (signal < -threshold)
+        positions = np.zeros((120, 3))
+        for day in range(120):
+            positions[day] = entries[max(0, day - holding):day].sum(axis=0) / holding
+        previous = np.vstack([np.zeros((1, 3)), positions[:-1]])
+        expected = ((positions * returns.to_numpy()).sum(axis=1)
+                    - cost * np.abs(positions - previous).sum(axis=1)) / 3
+        np.testing.assert_allclose(backtest.daily_returns(threshold, holding, cost), expected, atol=1e-6)
+
+        result = backtest.run([0.0, threshold], [1, holding], [0.0, cost], max_elements=1)
+        self.assertEqual(len(result), 8, "One row per grid combination expected.")
+        row = result[(result["threshold"] == threshold) & (result["holding_period"] == holding)
+                     & (result["cost"] == cost)].iloc[0]
+        self.assertAlmostEqual(row["total_return"], np.prod(1 + expected) - 1, places=5)
+
+    def test_runs_on_multi_ticker_analysis(self):
+        """Test the grid runs on the analysis panels and costs lower returns"""
+        analysis = MultiTickerAnalysis(self.news_file, list(self.stock_files.values()))
+        analysis.normalize_dates()
+        analysis.analyze_sentiment(n_workers=1)
+        backtest = SentimentBacktest.from_analysis(analysis, signal="zscore", zscore_window=10)
+
+        # A fresh analysis gets its dates normalized instead of an empty backtest
+        fresh = SentimentBacktest.from_analysis(
+            MultiTickerAnalysis(self.news_file, list(self.stock_files.values()))
+        )
+        self.assertGreater(len(fresh.dates), 0)
+        self.assertTrue(fresh.dates.equals(SentimentBacktest.from_analysis(analysis).dates))
+        with self.assertRaises(ValueError):
+            SentimentBacktest(analysis.daily_sentiment.set_axis(
+                analysis.daily_sentiment.index.astype(str)), analysis.returns)
+        result = backtest.run(thresholds=[0.0, 0.5], holding_periods=[1, 5], costs=[0.0, 0.01])
+
+        self.assertEqual(list(result.columns), ["threshold", "holding_period", "cost"] + METRICS)
+        free = result[result["cost"] == 0.0]["annual_return"].to_numpy()
+        costly = result[result["cost"] == 0.01]["annual_return"].to_numpy()
+        self.assertTrue((costly <= free).all(), "Costs should never raise returns.")
+        self.assertTrue((result["max_drawdown"] <= 0).all())
+
+
+class TestCompactCorrelation(CorrelationTestCase):
+
+    def test_compact_layout_keeps_the_correlation(self):
+        """Test the compact frame gives exactly the correlation of the object layout"""
+        results = []
+        for compact in (True, False):
+            analysis = CombinedAnalysis(self.news_file, self.stock_files["AAPL"], compact=compact)
+            analysis.analyze_sentiment(n_workers=1)
+            results.append(analysis.correlate_with_sentiment()[0])
+        self.assertEqual(results[0], results[1], "float32 storage should not change the result.")
+        self.assertEqual(analysis.news_df["sentiment"].dtype, np.float64)
+
+
+class TestPublicationDays(CorrelationTestCase):
+
+    def test_non_utc_offsets_keep_their_day(self):
+        """Test -04:00 headlines count for the day they were published"""
+        raw_news = os.path.join(self.tmp_dir.name, "raw_news_eastern.csv")
+        make_news_csv(raw_news, rows=200, offset="-04:00")
+        news_df = pd.read_csv(raw_news).rename(columns={"date": "Date"})
+        path = os.path.join(self.tmp_dir.name, "news_eastern.csv")
+        news_df.to_csv(path, index=False)
+
+        published = pd.to_datetime(news_df["Date"].str.slice(0, 10)).dt.date
+        scores = SentimentEngine(n_workers=1).score(news_df["headline"])
+        expected = pd.Series(scores).groupby(published).mean()
+
+        daily = CombinedAnalysis(path, self.stock_files["AAPL"]).analyze_sentiment(n_workers=1)
+        self.assertEqual(list(daily["Date"]), list(expected.index), "Days should not move to UTC.")
+        np.testing.assert_array_equal(daily["sentiment"], expected.to_numpy())
+
+        streamed = CombinedAnalysis(path, self.stock_files["AAPL"], chunk_size=50)
+        streamed_daily = streamed.analyze_sentiment(n_workers=1)
+        self.assertEqual(list(streamed_daily["Date"]), list(expected.index))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,346 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from scripts.Date_Normalizer import DateNormalizer, local_time
+from scripts.News_Stream import NewsStream
+from scripts.Publication_Cube import PublicationCube
+from scripts.Publisher_Index import PublisherIndex
+from scripts.Topic_Model import HeadlineTopicModel
+from scripts.Sentiment_Analysis import NewsAnalysis
+
+
+def make_news_csv(path, rows=60, offset="+00:00"):
+    """Write a small synthetic news file in the raw analyst ratings layout"""
+    rng = np.random.default_rng(0)
+    headlines = [
+        "Apple shares rally after strong earnings beat",
+        "Tesla stock plunges on terrible delivery numbers",
+        "Microsoft announces quarterly dividend",
+        "Nvidia posts record revenue, very impressive quarter",
+    ]
+    publishers = ["Benzinga Newsdesk", "Lisa Levin", "vick@benzinga.com", "Zacks"]
+    stamps = pd.date_range("2020-05-28 09:00", periods=rows, freq="7h")
+    pd.DataFrame({
+        "headline": rng.choice(headlines, rows),
+        "url": "https://www.benzinga.com/news",
+        "publisher": rng.choice(publishers, rows),
+        "date": stamps.strftime("%Y-%m-%d %H:%M:%S") + offset,
+        "stock": rng.choice(["AAPL", "TSLA"], rows),
+    }).to_csv(path, index=False)
+
+
+class NewsFileTestCase(unittest.TestCase):
+    rows = 60
+    offset = "+00:00"
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the synthetic news file"""
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.file_path = os.path.join(cls.tmp_dir.name, "news.csv")
+        make_news_csv(cls.file_path, rows=cls.rows, offset=cls.offset)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+
+class TestNewsStream(NewsFileTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.analysis = NewsAnalysis(cls.file_path)
+
+    def test_stream_matches_in_memory_aggregates(self):
+        """Test chunked aggregates equal the full-frame results"""
+        streamed = NewsAnalysis(self.file_path, chunk_size=7)
+        pd.testing.assert_series_equal(
+            streamed.articles_per_publisher().sort_index(),
+            self.analysis.articles_per_publisher().sort_index(),
+            check_names=False,
+        )
+        self.assertEqual(
+            streamed.publication_trends().tolist(),
+            self.analysis.publication_trends().tolist(),
+            "Monthly counts should match.",
+        )
+        self.assertEqual(streamed.stream.chunks, 9, "60 rows in chunks of 7 give 9 chunks.")
+
+    def test_stream_scores_only_for_sentiment(self):
+        """Test counting does not score headlines and frame methods fail clearly"""
+        streamed = NewsAnalysis(self.file_path, chunk_size=7, n_workers=1, backend="fast")
+        streamed.articles_per_publisher()
+        streamed.publication_trends()
+        self.assertTrue(streamed.stream.sentiment_count.empty, "Counts should not score headlines.")
+        self.assertEqual(streamed.stream.engine_options["backend"], "fast")
+
+        daily = streamed.daily_sentiment()
+        self.assertEqual(int(streamed.stream.sentiment_count.sum()), 60)
+        self.assertEqual(streamed.stream.rows, 60, "The scoring pass should not count rows twice.")
+        self.assertEqual(len(daily), self.analysis.publication_frequency().gt(0).sum())
+        for method in [streamed.sentiment_analysis, streamed.publication_frequency, streamed.domain_counts]:
+            with self.assertRaisesRegex(ValueError, "streaming mode"):
+                method()
+
+    def test_constructor_engine_settings_are_kept(self):
+        """Test sentiment_analysis without arguments keeps the constructor's backend and cache"""
+        cache_path = os.path.join(self.tmp_dir.name, "scores.sqlite")
+        analysis = NewsAnalysis(
+            self.file_path, n_workers=1, cache_path=cache_path, backend="fast",
+            output_dir=self.tmp_dir.name,
+        )
+        analysis.sentiment_analysis()
+        self.assertEqual(analysis.graph.get("backend"), "fast")
+        self.assertEqual(analysis.engine_options["cache_path"], cache_path)
+        self.assertIsNotNone(analysis.sentiment_cache_stats, "The score cache should be used.")
+
+        analysis.sentiment_analysis(chunk_size=10)
+        self.assertEqual(analysis.graph.computations["sentiment"], 1, "Headlines are scored once.")
+        self.assertEqual(analysis.engine_options["chunk_size"], 10)
+
+    def test_stream_daily_sentiment(self):
+        """Test streamed daily sentiment equals a one-shot groupby"""
+        stream = NewsStream(self.file_path, chunk_size=11, n_workers=1).run()
+        daily = stream.daily_sentiment()
+
+        full = NewsStream(self.file_path, chunk_size=1000, n_workers=1).run()
+        np.testing.assert_allclose(daily["sentiment"], full.daily_sentiment()["sentiment"])
+        self.assertEqual(stream.rows, 60, "Every row should be streamed.")
+
+
+class TestDateNormalizer(unittest.TestCase):
+
+    def test_mixed_formats_parse_to_utc(self):
+        """Test each format is detected and converted to UTC"""
+        dates = pd.Series([
+            "2020-06-05 10:30:54-04:00",
+            "2020-06-05 10:30:54-05:00",
+            "6/1/2020 9:30",
+            "June 3, 2020",
+            "not a date",
+            None,
+        ])
+        normalizer = DateNormalizer()
+        parsed = normalizer.normalize(dates)
+
+        self.assertEqual(str(parsed.dtype), "datetime64[ns, UTC]", "Dates should be UTC-aware.")
+        self.assertEqual(parsed[0], pd.Timestamp("2020-06-05 14:30:54", tz="UTC"))
+        self.assertEqual(parsed[1], pd.Timestamp("2020-06-05 15:30:54", tz="UTC"))
+        self.assertEqual(parsed[2], pd.Timestamp("2020-06-01 09:30", tz="UTC"))
+        self.assertEqual(parsed[3], pd.Timestamp("2020-06-03", tz="UTC"))
+        self.assertTrue(parsed[4:].isna().all(), "Bad or missing dates should become NaT.")
+        self.assertEqual(
+            normalizer.last_stats,
+            {"iso_offset": 2, "us_minute": 1, "fallback": 1, "unparsed": 2},
+        )
+
+    def test_repeated_strings_are_memoized(self):
+        """Test strings seen in an earlier call are served from the cache"""
+        normalizer = DateNormalizer()
+        first = normalizer.normalize(pd.Series(["2020-06-05 10:30:54-04:00"] * 3))
+        second = normalizer.normalize(pd.Series(["2020-06-05 10:30:54-04:00"]))
+        self.assertEqual(len(normalizer._cache_keys), 1, "Distinct strings should be parsed once.")
+        self.assertEqual(first[0], second[0])
+        self.assertEqual(normalizer.stats, {"iso_offset": 4})
+
+    def test_days_keep_the_published_offset(self):
+        """Test days are taken in each row's own offset, not the UTC day"""
+        dates = pd.Series(["2020-06-05 22:30:00-04:00", "2020-06-05 08:00:00-04:00", "6/5/2020 23:00"])
+        normalizer = DateNormalizer()
+        parsed = normalizer.normalize(dates)
+        self.assertEqual(parsed[0], pd.Timestamp("2020-06-06 02:30", tz="UTC"), "Timestamps stay UTC.")
+        np.testing.assert_array_equal(normalizer.last_offsets, [-240, -240, 0])
+        days = local_time(parsed, normalizer.last_offsets).dt.date
+        self.assertEqual(set(days), {pd.Timestamp("2020-06-05").date()}, "All rows were published on June 5.")
+
+
+class TestCompactFrame(NewsFileTestCase):
+    rows = 300
+
+    def analysis(self, compact):
+        analysis = NewsAnalysis(self.file_path, compact=compact,
+                                output_dir=os.path.join(self.tmp_dir.name, "charts"))
+        analysis.sentiment_analysis(n_workers=1)
+        analysis.analyze_publisher_domains()
+        return analysis
+
+    def test_compact_layout(self):
+        """Test low-cardinality columns are categorical and scores float32"""
+        analysis = self.analysis(compact=True)
+        for column in ["publisher", "stock", "domain", "sentiment"]:
+            self.assertIsInstance(analysis.df[column].dtype, pd.CategoricalDtype, column)
+        self.assertEqual(analysis.df["sentiment_score"].dtype, np.float32)
+        self.assertEqual(list(analysis.df["sentiment"].cat.categories), ["Negative", "Neutral", "Positive"])
+
+        report = analysis.memory_report()
+        self.assertIn("total", set(report["column"]))
+        plain = self.analysis(compact=False).memory_report()
+        self.assertLess(
+            report.loc[report["column"] == "total", "megabytes"].iloc[0],
+            plain.loc[plain["column"] == "total", "megabytes"].iloc[0],
+        )
+
+    def test_outputs_match_object_layout(self):
+        """Test the compact frame gives the same analysis results"""
+        compact, plain = self.analysis(compact=True), self.analysis(compact=False)
+        pd.testing.assert_series_equal(compact.articles_per_publisher(), plain.articles_per_publisher())
+        pd.testing.assert_series_equal(compact.publication_trends(), plain.publication_trends())
+        pd.testing.assert_series_equal(compact.domain_counts(), plain.domain_counts())
+        pd.testing.assert_series_equal(compact.analyze_publisher_domains(), plain.analyze_publisher_domains())
+        pd.testing.assert_frame_equal(compact.daily_sentiment(), plain.daily_sentiment())
+
+
+class TestPublisherIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Publishers with ties, missing values and email addresses"""
+        self.publishers = pd.Series(
+            ["Zacks", "vick@benzinga.com", "Lisa Levin", "Zacks", None, "webmaster@benzinga.com",
+             "Lisa Levin", "jj@fool.com", "vick@benzinga.com", "Zacks"],
+            name="publisher",
+        )
+
+    def test_matches_value_counts(self):
+        """Test counts, ties and positions match per-row pandas results"""
+        for publishers in [self.publishers, self.publishers.astype("category")]:
+            index = PublisherIndex(publishers)
+            pd.testing.assert_series_equal(
+                index.publisher_counts(), self.publishers.value_counts(), check_index_type=False
+            )
+            np.testing.assert_array_equal(index.positions("Lisa Levin"), [2, 6])
+            self.assertEqual(len(index.positions("Unknown")), 0)
+
+    def test_one_domain_rule(self):
+        """Test both domain queries use the same extraction"""
+        index = PublisherIndex(self.publishers)
+        domains = pd.Series(index.row_domains(), name="domain").astype(object)
+        pd.testing.assert_series_equal(index.domain_counts(), domains.value_counts(), check_index_type=False)
+        self.assertEqual(index.domain_counts(email_only=True).to_dict(), {"benzinga.com": 3, "fool.com": 1})
+        self.assertEqual(index.domain_counts()["benzinga.com"], 3)
+
+    def test_label_counts_match_groupby(self):
+        """Test the publisher x label table matches groupby/unstack"""
+        labels = pd.Series(list("PNPNPPNNPN"), name="sentiment")
+        frame = pd.DataFrame({"publisher": self.publishers, "sentiment": labels})
+        expected = frame.groupby(["publisher", "sentiment"]).size().unstack(fill_value=0)
+        pd.testing.assert_frame_equal(PublisherIndex(self.publishers).label_counts(labels), expected)
+
+    def test_rebuilt_for_a_new_frame(self):
+        """Test assigning another frame of equal length rebuilds the index"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "news.csv")
+            make_news_csv(path)
+            analysis = NewsAnalysis(path)
+        analysis.articles_per_publisher()
+        other = analysis.df.copy()
+        other["publisher"] = "Reuters"
+        analysis.df = other
+        self.assertEqual(analysis.articles_per_publisher().to_dict(), {"Reuters": 60})
+
+
+class TestPublicationCube(NewsFileTestCase):
+    rows = 300
+    # A US Eastern offset, so UTC days and published days differ
+    offset = "-04:00"
+
+    def published(self, analysis):
+        """The news frame indexed by wall-clock publication time"""
+        return analysis.df.set_index(local_time(analysis.df["date"], analysis.df["utc_offset"]).rename("date"))
+
+    def test_trends_match_raw_rows(self):
+        """Test monthly, daily and hourly counts match per-row pandas results"""
+        analysis = NewsAnalysis(self.file_path)
+        raw = pd.read_csv(self.file_path)["date"]
+        expected_monthly = raw.str.slice(0, 7).map(pd.Period).rename("year_month").value_counts().sort_index()
+        expected_daily = self.published(analysis).resample("D").size()
+        expected_hourly = self.published(analysis).resample("h").size()
+
+        pd.testing.assert_series_equal(analysis.publication_trends(), expected_monthly)
+        pd.testing.assert_series_equal(analysis.publication_frequency(), expected_daily)
+        pd.testing.assert_series_equal(analysis.hourly_frequency(), expected_hourly)
+        # Repeated calls no longer move the date column into the index
+        pd.testing.assert_series_equal(analysis.publication_frequency(), expected_daily)
+        self.assertIn("date", analysis.df.columns)
+
+    def test_slices_and_sentiment(self):
+        """Test publisher/stock slices and sentiment means come from the cube"""
+        analysis = NewsAnalysis(self.file_path)
+        analysis.sentiment_analysis(n_workers=1)
+        cube = analysis.publication_cube()
+        rows = ((analysis.df["publisher"] == "Zacks") & (analysis.df["stock"] == "AAPL")).to_numpy()
+        expected = self.published(analysis)[rows].resample("D").size()
+        pd.testing.assert_series_equal(cube.daily(publisher="Zacks", stock="AAPL"), expected)
+
+        days = pd.to_datetime(pd.read_csv(self.file_path)["date"].str.slice(0, 10)).rename("date")
+        expected_sentiment = analysis.df["sentiment_score"].astype(float).groupby(days).mean()
+        np.testing.assert_allclose(cube.sentiment("D").to_numpy(), expected_sentiment.to_numpy())
+
+    def test_persisted_cube_is_reused(self):
+        """Test a saved cube is loaded on the next run and matches a chunked build"""
+        cube_path = os.path.join(self.tmp_dir.name, "cube.parquet")
+        first = NewsAnalysis(self.file_path, cube_path=cube_path)
+        trends = first.publication_trends()
+        self.assertTrue(os.path.exists(cube_path))
+
+        second = NewsAnalysis(self.file_path, cube_path=cube_path)
+        cube = second.publication_cube()
+        self.assertEqual(cube.rows, 300)
+        pd.testing.assert_series_equal(second.publication_trends(), trends)
+
+        chunked = PublicationCube.from_csv(self.file_path, chunk_size=70)
+        pd.testing.assert_series_equal(chunked.monthly(), trends)
+        pd.testing.assert_series_equal(chunked.hourly(), second.hourly_frequency())
+        self.assertEqual(chunked.fingerprint, cube.fingerprint, "Both builds hold the same rows.")
+
+    def test_saved_cube_of_another_file_is_rebuilt(self):
+        """Test a saved cube is not reused for a different file of equal length"""
+        cube_path = os.path.join(self.tmp_dir.name, "shared_cube.parquet")
+        NewsAnalysis(self.file_path, cube_path=cube_path).publication_trends()
+
+        other_path = os.path.join(self.tmp_dir.name, "other_news.csv")
+        other = pd.read_csv(self.file_path)
+        other["date"] = "2021-07-15 10:00:00-04:00"
+        other.to_csv(other_path, index=False)
+        trends = NewsAnalysis(other_path, cube_path=cube_path).publication_trends()
+        self.assertEqual(trends.to_dict(), {pd.Period("2021-07"): 300})
+        self.assertEqual(NewsAnalysis(other_path, cube_path=cube_path).publication_cube().rows, 300)
+
+
+class TestTopicModel(NewsFileTestCase):
+    rows = 400
+
+    def test_batched_fit_labels_every_headline(self):
+        """Test small batches fit a model and repeated headlines share a topic"""
+        headlines = pd.read_csv(self.file_path)["headline"]
+        model = HeadlineTopicModel(n_topics=3, n_features=2 ** 12, batch_size=64, n_jobs=1)
+        topics = model.fit(headlines).transform(headlines)
+
+        self.assertEqual(len(topics), len(headlines))
+        self.assertTrue(((topics >= 0) & (topics < 3)).all())
+        self.assertEqual(pd.Series(topics).groupby(headlines.to_numpy()).nunique().max(), 1)
+        self.assertTrue(model.top_terms(3)["terms"].str.len().gt(0).all(), "Topics should have named terms.")
+
+        streamed = HeadlineTopicModel(n_topics=3, n_features=2 ** 12, batch_size=64, n_jobs=1)
+        np.testing.assert_array_equal(streamed.fit_csv(self.file_path).transform(headlines), topics)
+
+    def test_topic_sentiment_breakdown(self):
+        """Test the per-topic daily sentiment adds up to the daily series"""
+        analysis = NewsAnalysis(self.file_path)
+        analysis.sentiment_analysis(n_workers=1)
+        analysis.topic_modeling(n_topics=3, batch_size=100, n_jobs=1)
+        breakdown = analysis.topic_sentiment()
+
+        self.assertEqual(breakdown["articles"].sum(), len(analysis.df))
+        weighted = (breakdown["sentiment"] * breakdown["articles"]).groupby(breakdown["Date"]).sum()
+        daily = analysis.daily_sentiment().set_index("Date")["sentiment"]
+        articles = breakdown.groupby("Date")["articles"].sum()
+        np.testing.assert_allclose((weighted / articles).to_numpy(), daily.to_numpy(), rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from scripts.Price_Fetcher import PriceFetcher, PriceStore, RecordingSource, ReplaySource
+from scripts.Stock_Data_EDA import EDA
+
+
+def make_bars(dates):
+    """Synthetic daily bars in the yfinance layout"""
+    return pd.DataFrame({
+        "Date": pd.to_datetime(dates),
+        "Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Adj Close": 1.5,
+        "Volume": 100, "Dividends": 0.0, "Stock Splits": 0.0,
+    })
+
+
+class SlowSource:
+    """Stand-in source that sleeps like a network call and tracks concurrency"""
+
+    def __init__(self, delay=0.2, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, ticker, start, end):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.calls <= self.failures
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if fail:
+            raise ConnectionError("temporary failure")
+        return make_bars(pd.bdate_range(start, end - pd.Timedelta(days=1)))
+
+
+class TestPriceFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = PriceStore(os.path.join(self.tmp_dir.name, "store"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_replay_appends_only_missing_bars(self):
+        """Test only bars after the stored ones are fetched, in the file's date format"""
+        bars = make_bars(pd.bdate_range("2024-07-01", "2024-07-12"))
+        stored = bars[bars["Date"] <= "2024-07-05"].assign(
+            Date=lambda df: df["Date"].dt.month.astype(str) + "/" + df["Date"].dt.day.astype(str) + "/2024"
+        )
+        stored.to_csv(self.store.path("AAPL"), index=False)
+
+        # Record a live-like source once, then replay the fixture offline
+        fixtures = os.path.join(self.tmp_dir.name, "fixtures")
+        RecordingSource(SlowSource(delay=0), fixtures).fetch(
+            "AAPL", pd.Timestamp("2024-07-01"), pd.Timestamp("2024-07-13")
+        )
+
+        fetcher = PriceFetcher(ReplaySource(fixtures), self.store, max_concurrency=2)
+        report = fetcher.refresh(["AAPL"], end="2024-07-13").set_index("ticker")
+        self.assertEqual(report.loc["AAPL", "rows"], 5)
+        self.assertEqual(report.loc["AAPL", "start"], pd.Timestamp("2024-07-06"))
+
+        saved = pd.read_csv(self.store.path("AAPL"))
+        self.assertEqual(saved["Date"].tolist()[-2:], ["7/11/2024", "7/12/2024"])
+        self.assertEqual(len(saved), len(bars))
+
+        again = fetcher.refresh(["AAPL"], end="2024-07-13")
+        self.assertEqual(again["status"].iloc[0], "up to date")
+
+        eda = EDA(self.store.path("AAPL"))
+        eda.load_data()
+        self.assertEqual(eda.df["Date"].max(), pd.Timestamp("2024-07-12"))
+
+    def test_appends_in_the_layout_of_the_stored_file(self):
+        """Test new bars follow the columns of a narrower existing file"""
+        stored = make_bars(pd.bdate_range("2024-07-01", "2024-07-03"))[["Date", "Close", "Volume"]]
+        stored.to_csv(self.store.path("MSFT"), index=False, date_format="%Y-%m-%d")
+
+        written = self.store.append("MSFT", make_bars(pd.bdate_range("2024-07-05", "2024-07-08")))
+        self.assertEqual(written, 2)
+        saved = pd.read_csv(self.store.path("MSFT"))
+        self.assertEqual(list(saved.columns), ["Date", "Close", "Volume"])
+        self.assertEqual(saved["Date"].tolist()[-2:], ["2024-07-05", "2024-07-08"])
+        self.assertEqual(saved["Close"].tolist(), [1.5] * 5, "Closes should stay in their column.")
+        self.assertEqual(saved["Volume"].tolist(), [100] * 5)
+
+    def test_bounded_concurrency(self):
+        """Test tickers are fetched concurrently but never above the limit"""
+        source = SlowSource(delay=0.2)
+        fetcher = PriceFetcher(source, self.store, max_concurrency=8)
+        tickers = [f"T{i}" for i in range(24)]
+
+        started = time.perf_counter()
+        report = fetcher.refresh(tickers, end="2024-01-10", default_start="2024-01-01")
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue((report["status"] == "updated").all())
+        self.assertLessEqual(source.max_in_flight, 8)
+        self.assertLess(elapsed, 24 * 0.2 / 2, "Fetches should overlap.")
+        self.assertTrue(os.path.exists(self.store.path("T23")))
+
+    def test_retries_then_reports_failures(self):
+        """Test transient errors are retried and persistent ones reported"""
+        flaky = PriceFetcher(SlowSource(delay=0, failures=1), self.store, retries=2, backoff=0)
+        report = flaky.refresh(["AAA"], end="2024-01-10", default_start="2024-01-01")
+        self.assertEqual(report["status"].iloc[0], "updated")
+
+        broken = PriceFetcher(SlowSource(delay=0, failures=10), self.store, retries=1, backoff=0)
+        report = broken.refresh(["BBB"], end="2024-01-10", default_start="2024-01-01")
+        self.assertEqual(report["status"].iloc[0], "failed")
+        self.assertIn("temporary failure", report["error"].iloc[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from textblob import TextBlob  # type: ignore
+
+from scripts.Lexicon_Scorer import LexiconScorer, agreement_report
+from scripts.Sentiment_Cache import SentimentCache
+from scripts.Sentiment_Engine import SentimentEngine
+
+
+HEADLINES = [
+    "Apple shares rally after strong earnings beat",
+    "Tesla stock plunges on terrible delivery numbers",
+    "Microsoft announces quarterly dividend",
+    "Analysts say Amazon is not a good buy right now",
+    "Nvidia posts record revenue, very impressive quarter",
+    "Stocks That Hit 52-Week Lows On Friday",
+] * 5
+
+
+class TestSentimentEngine(unittest.TestCase):
+
+    def setUp(self):
+        """Compute the reference polarity the per-row way"""
+        self.expected = np.array([TextBlob(h).sentiment.polarity for h in HEADLINES])
+
+    def test_single_worker_matches_textblob(self):
+        """Test in-process scoring matches TextBlob exactly"""
+        engine = SentimentEngine(n_workers=1)
+        polarity = engine.score(HEADLINES)
+        self.assertEqual(polarity.dtype, np.float64, "Polarity should be float64.")
+        np.testing.assert_array_equal(polarity, self.expected)
+
+    def test_process_pool_matches_textblob(self):
+        """Test chunked multi-process scoring keeps order and values"""
+        engine = SentimentEngine(n_workers=2, chunk_size=4)
+        polarity = engine.score(HEADLINES)
+        np.testing.assert_array_equal(polarity, self.expected)
+
+    def test_throughput_is_reported(self):
+        """Test throughput numbers are kept after a run"""
+        engine = SentimentEngine(n_workers=1)
+        engine.score(HEADLINES)
+        self.assertEqual(engine.last_rows, len(HEADLINES), "All rows should be counted.")
+        self.assertGreater(engine.last_throughput, 0, "Throughput should be positive.")
+        self.assertIn("rows/s", engine.throughput_report())
+
+
+class TestLexiconScorer(unittest.TestCase):
+
+    def test_plain_headlines_match_textblob(self):
+        """Test headlines without modifiers or negations score like TextBlob"""
+        plain = ["Apple shares rally after strong earnings beat", "Stocks close flat", "Great quarter"]
+        expected = np.array([TextBlob(h).sentiment.polarity for h in plain])
+        np.testing.assert_allclose(LexiconScorer().score(plain), expected)
+
+    def test_fast_backend_through_engine(self):
+        """Test the engine dispatches to the fast backend"""
+        engine = SentimentEngine(backend="fast")
+        polarity = engine.score(HEADLINES)
+        self.assertEqual(polarity.shape, (len(HEADLINES),), "One score per headline expected.")
+        self.assertTrue(np.all((polarity >= -1) & (polarity <= 1)), "Polarity should be in [-1, 1].")
+
+    def test_unknown_backend_raises(self):
+        """Test an unknown backend name is rejected"""
+        with self.assertRaises(ValueError):
+            SentimentEngine(backend="vader")
+
+    def test_agreement_report(self):
+        """Test the agreement report compares both backends"""
+        report = agreement_report(HEADLINES)
+        self.assertEqual(report["rows"], len(HEADLINES))
+        self.assertGreater(report["label_agreement"], 0.5, "Backends should mostly agree on labels.")
+
+
+class TestSentimentCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a fresh cache file for every test"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "sentiment.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_second_run_is_served_from_cache(self):
+        """Test only misses are scored and repeated runs hit the cache"""
+        expected = np.array([TextBlob(h).sentiment.polarity for h in HEADLINES])
+
+        engine = SentimentEngine(n_workers=1, cache_path=self.cache_path)
+        np.testing.assert_array_equal(engine.score(HEADLINES), expected)
+        self.assertEqual(engine.last_cache_stats["hits"], 0, "First run should only miss.")
+        self.assertEqual(engine.last_cache_stats["entries"], 6, "Duplicates should be stored once.")
+        engine.close()
+
+        engine = SentimentEngine(n_workers=1, cache_path=self.cache_path)
+        np.testing.assert_array_equal(engine.score(HEADLINES), expected)
+        self.assertEqual(engine.last_cache_stats["misses"], 0, "Second run should only hit.")
+        engine.close()
+
+    def test_key_ignores_whitespace_but_not_version(self):
+        """Test keys use the normalized headline and the scorer version"""
+        cache = SentimentCache(self.cache_path, "v1")
+        other = SentimentCache(self.cache_path, "v2")
+        self.assertEqual(cache.make_key("Apple  rallies "), cache.make_key("Apple rallies"))
+        self.assertNotEqual(cache.make_key("Apple rallies"), other.make_key("Apple rallies"))
+        cache.close()
+        other.close()
+
+    def test_lru_eviction_keeps_recent_entries(self):
+        """Test the size cap evicts the least recently used entries"""
+        cache = SentimentCache(self.cache_path, "v1", max_entries=2)
+        cache.put_many([("a", 0.1), ("b", 0.2)])
+        cache.get_many(["a"])
+        cache.put_many([("c", 0.3)])
+        self.assertEqual(len(cache), 2, "Cache should respect its size cap.")
+        self.assertEqual(set(cache.get_many(["a", "b", "c"])), {"a", "c"})
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,14 @@
 import os
+import tempfile
 import unittest
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from scripts.Chart_Renderer import STOCK_CHARTS, render_news_charts, render_stock_charts
+from scripts.Sentiment_Analysis import NewsAnalysis
 from scripts.Stock_Data_EDA import EDA  # Import the EDA class
+from scripts.Technical_Indicators import compute_indicators, load_price_panel
+from tests.Test_For_News_Analysis import make_news_csv
 
 
 class TestEDA(unittest.TestCase):
@@ -98,5 +105,77 @@ class TestEDA(unittest.TestCase):
 
         self.assertTrue(plot_successful, "plot_calculate_macd should complete without exceptions.")
 
+class TestHeadlessCharts(unittest.TestCase):
+
+    def test_render_stock_charts_to_files(self):
+        """Test charts are written to files without touching pyplot state"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "TEST_historical_data.csv")
+            pd.DataFrame({
+                "Date": pd.date_range(start="2022-01-01", periods=100, freq="D"),
+                "Close": pd.Series(range(100)),
+                "Volume": pd.Series(range(100, 200)),
+            }).to_csv(file_path, index=False)
+
+            open_figures = len(plt.get_fignums())
+            output_dir = os.path.join(tmp_dir, "charts")
+            rendered = render_stock_charts([file_path], output_dir, formats=("png", "svg"), n_workers=1)
+
+            paths = rendered[file_path]
+            self.assertEqual(len(paths), 2 * len(STOCK_CHARTS), "Every chart should be written in both formats.")
+            self.assertTrue(all(os.path.exists(path) for path in paths), "Chart files should exist.")
+            self.assertIn(os.path.join(output_dir, "TEST_rsi.png"), paths)
+            self.assertEqual(len(plt.get_fignums()), open_figures, "No pyplot figures should be left open.")
+
+    def test_render_news_charts_to_files(self):
+        """Test every news chart, including the sentiment distribution, is written"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "news.csv")
+            make_news_csv(file_path)
+            output_dir = os.path.join(tmp_dir, "charts")
+            analysis = NewsAnalysis(file_path, output_dir=output_dir, n_workers=1)
+
+            paths = render_news_charts(analysis)
+            names = [os.path.basename(path) for path in paths]
+            self.assertEqual(names, [
+                "news_headline_length.png", "news_top_publishers.png", "news_publication_trends.png",
+                "news_domain_distribution.png", "news_sentiment.png", "news_sentiment_per_publisher.png",
+            ])
+            self.assertTrue(all(os.path.exists(path) for path in paths), "Chart files should exist.")
+
+class TestTechnicalIndicators(unittest.TestCase):
+
+    def test_panel_matches_single_ticker_eda(self):
+        """Test panel indicators match the per-ticker EDA computations"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rng = np.random.default_rng(0)
+            dates = pd.date_range(start="2022-01-03", periods=120, freq="B")
+            paths = []
+            for ticker in ("AAA", "BBB"):
+                path = os.path.join(tmp_dir, f"{ticker}_historical_data.csv")
+                pd.DataFrame({
+                    "Date": dates.strftime("%Y-%m-%d"),
+                    "Close": 100 + rng.normal(0, 1, len(dates)).cumsum(),
+                    "Volume": rng.integers(1000, 2000, len(dates)),
+                }).to_csv(path, index=False)
+                paths.append(path)
+
+            panel = load_price_panel(paths)
+            indicators = compute_indicators(panel, sma_windows=(20, 50))
+            self.assertEqual(list(panel.columns), ["AAA", "BBB"])
+            self.assertTrue((indicators.dtypes == np.float32).all(), "Indicators should be float32.")
+
+            eda = EDA(paths[1], output_dir=os.path.join(tmp_dir, "charts"))
+            eda.load_data()
+            eda.plot_calculate_rsi()
+            eda.calculate_moving_averages(window_size=20)
+            eda.plot_calculate_macd()
+            for column in ("RSI", "SMA_20", "MACD", "Signal Line"):
+                np.testing.assert_allclose(
+                    indicators[column]["BBB"].to_numpy(), eda.df[column].to_numpy(),
+                    rtol=1e-5, err_msg=f"{column} should match the EDA result.",
+                )
+
+
 if __name__ == "__main__":
     unittest.main()